@@ -0,0 +1,40 @@
+import math
+
+
+def get_zone_radius(func, value: float, radius_min: float, tolerance: float = 0.01,
+                    max_iter: int = 200) -> float:
+    """
+    Поиск расстояния, на котором монотонно убывающая функция func(radius)
+    опускается до порогового значения value (расширение интервала + бисекция)
+
+    :@param func: функция поражающего фактора от расстояния, func(radius) -> float
+    :@param value: пороговое значение поражающего фактора
+    :@param radius_min: минимальное расчетное расстояние, м
+    :@param tolerance: точность определения расстояния, м
+    :@param max_iter: ограничение числа итераций на каждом этапе
+
+    :@return: float: радиус зоны, м (0 - если порог не достигается даже на radius_min)
+    """
+    if func(radius_min) < value:
+        return 0
+
+    # расширим интервал, пока значение на правой границе не станет меньше порога
+    low = radius_min
+    high = 2 * radius_min
+    for _ in range(max_iter):
+        if func(high) <= value:
+            break
+        low, high = high, 2 * high
+
+    # бисекция до заданной точности
+    for _ in range(max_iter):
+        if high - low < tolerance:
+            break
+        middle = (low + high) / 2
+        if func(middle) > value:
+            low = middle
+        else:
+            high = middle
+
+    digits = max(0, -math.floor(math.log10(tolerance)))
+    return round((low + high) / 2, digits)
@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+import numpy as np
+
+CACHE_SIZE = 64  # максимальное количество сохраненных результатов
+CACHE_ELEMENTS = 2 * 10 ** 6  # максимальное суммарное количество элементов (чисел) в сохраненных результатах
+KEY_DIGITS = 10  # количество значащих цифр входных параметров в ключе
+
+Cache_info = namedtuple('Cache_info', ['hits', 'misses', 'maxsize', 'currsize', 'maxelements', 'currelements'])
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_sizes = {}  # количество элементов каждого сохраненного результата
+_stats = {'hits': 0, 'misses': 0, 'maxsize': CACHE_SIZE, 'maxelements': CACHE_ELEMENTS, 'elements': 0}
+
+
+def _key_value(value):
+    """
+    Округление входного параметра для ключа (числа - до KEY_DIGITS значащих цифр)
+    """
+    if isinstance(value, float):
+        return float(f'{value:.{KEY_DIGITS}g}')
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_value(item) for item in value)
+    return value
+
+
+def _copy(value):
+    """
+    Копия результата (списки и массивы), чтобы изменение результата вызывающим кодом не портило кэш
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, (list, tuple)):
+        if value and not isinstance(value[0], (list, tuple, np.ndarray)):
+            return type(value)(value)
+        return type(value)(_copy(item) for item in value)
+    return value
+
+
+def _size(value) -> int:
+    """
+    Количество элементов (чисел) в результате
+    """
+    if isinstance(value, np.ndarray):
+        return value.size
+    if isinstance(value, (list, tuple)):
+        if value and not isinstance(value[0], (list, tuple, np.ndarray)):
+            return len(value)
+        return sum(_size(item) for item in value)
+    return 1
+
+
+def _evict():
+    """
+    Удаление самых старых результатов до выполнения ограничений кэша (вызывается под _lock)
+    """
+    while _cache and (len(_cache) > _stats['maxsize'] or _stats['elements'] > _stats['maxelements']):
+        key, _ = _cache.popitem(last=False)
+        _stats['elements'] -= _sizes.pop(key)
+
+
+def cached_result(method):
+    """
+    Декоратор метода расчета: результат сохраняется в общем ограниченном LRU-кэше
+    с ключом (метод, округленные атрибуты экземпляра, округленные параметры);
+    у классов без состояния атрибутов нет, и ключ от экземпляра не зависит.
+    Кэш ограничен количеством результатов и суммарным количеством элементов;
+    результат больше ограничения по элементам не сохраняется. При нехэшируемых
+    параметрах или атрибутах (например, массивах np.ndarray) кэш не используется.
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = tuple(sorted((k, _key_value(v)) for k, v in getattr(self, '__dict__', {}).items()))
+        key = (name, state, _key_value(args), tuple(sorted((k, _key_value(v)) for k, v in kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        with _lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                _stats['hits'] += 1
+                return _copy(_cache[key])
+            _stats['misses'] += 1
+
+        res = method(self, *args, **kwargs)
+
+        size = _size(res)
+        with _lock:
+            if _stats['maxsize'] > 0 and size <= _stats['maxelements'] and key not in _cache:
+                _cache[key] = _copy(res)
+                _sizes[key] = size
+                _stats['elements'] += size
+                _evict()
+        return res
+
+    return wrapper
+
+
+def cache_info() -> Cache_info:
+    """
+    Статистика кэша результатов
+    :@return: Cache_info: (hits, misses, maxsize, currsize, maxelements, currelements)
+    """
+    with _lock:
+        return Cache_info(_stats['hits'], _stats['misses'], _stats['maxsize'], len(_cache),
+                          _stats['maxelements'], _stats['elements'])
+
+
+def cache_clear():
+    """
+    Очистка кэша результатов и статистики
+    """
+    with _lock:
+        _cache.clear()
+        _sizes.clear()
+        _stats['elements'] = 0
+        _stats['hits'] = 0
+        _stats['misses'] = 0
+
+
+def set_cache_size(maxsize: int, maxelements: int = None):
+    """
+    Изменение размера кэша результатов (0 - кэш отключен)
+    :@param maxsize: максимальное количество сохраненных результатов
+    :@param maxelements: максимальное суммарное количество элементов (None - без изменения)
+    """
+    if maxsize < 0 or (maxelements is not None and maxelements < 0):
+        raise ValueError('Размер кэша не может быть отрицательным')
+    with _lock:
+        _stats['maxsize'] = maxsize
+        if maxelements is not None:
+            _stats['maxelements'] = maxelements
+        _evict()
@@ -0,0 +1,141 @@
+# -----------------------------------------------------------
+# Пакетный расчет сценариев без графического интерфейса
+#
+# Запуск: python -m calc.batch scenarios.csv -o results.jsonl
+#         python -m calc.batch scenarios.csv -o results.jsonl --workers 8 --timeout 60
+#
+# Входной файл CSV: в каждой строке наименование методики
+# (ключ METODS_AND_PARAMETRS) и далее значения параметров в том же
+# порядке, что и в GUI. Строка с первым полем "method" считается заголовком.
+# Входной файл JSONL: в каждой строке объект
+# {"id": ..., "method": "Пожар пролива", "params": [200, 0.06, 100, 63, 1]}
+# ("id" - необязательный).
+#
+# Результат: JSONL, по одной строке на сценарий в порядке входного файла
+# {"row": ..., "id": ..., "method": ..., "params": [...], "result": {...}}
+# или {"row": ..., ..., "error": "..."} если расчет сценария не удался.
+# -----------------------------------------------------------
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+
+from calc.methods import calculate
+from calc.parallel import parallel_map
+
+
+def read_scenarios(path: str, delimiter: str = ','):
+    """
+    Чтение сценариев из файла CSV или JSONL (по расширению файла)
+    :param path: - путь к файлу ("-" - стандартный ввод, формат CSV)
+    :param delimiter: - разделитель полей CSV
+    :return: генератор словарей {"row", "id", "method", "params"}
+    """
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+        if path.endswith('.jsonl') or path.endswith('.json'):
+            for row, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                yield {'row': row, 'id': item.get('id'), 'method': item['method'], 'params': item['params']}
+        else:
+            for row, line in enumerate(csv.reader(stream, delimiter=delimiter), start=1):
+                if not line or line[0].strip() == 'method':
+                    continue
+                yield {'row': row, 'id': None, 'method': line[0].strip(),
+                       'params': [value.strip() for value in line[1:] if value.strip()]}
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def parse_params(params: list) -> list:
+    """
+    Перевод значений параметров в числа (допускается десятичная запятая, как в GUI)
+    :param params: - список значений параметров
+    :return: список чисел
+    """
+    return [float(str(value).replace(',', '.')) for value in params]
+
+
+def run_scenario(scenario: dict) -> dict:
+    """
+    Расчет одного сценария, ошибка расчета записывается в результат
+    :param scenario: - словарь {"row", "id", "method", "params"}
+    :return: словарь результата для записи в выходной файл
+    """
+    res = dict(scenario)
+    try:
+        res['result'] = calculate(scenario['method'], parse_params(scenario['params']))
+    except Exception as error:
+        res['error'] = f'{type(error).__name__}: {error}'
+    return res
+
+
+def run_scenarios(scenarios, workers: int = 1, chunk_size: int = 64, timeout: float = None):
+    """
+    Расчет серии сценариев последовательно (workers = 1 без ограничения времени)
+    или параллельно в нескольких процессах
+    :param scenarios: - итератор словарей {"row", "id", "method", "params"}
+    :param workers: - количество процессов
+    :param chunk_size: - количество сценариев в пакете для одного процесса
+    :param timeout: - ограничение времени расчета одного сценария, с
+    :return: генератор словарей результатов в порядке сценариев
+    """
+    # вторая копия итератора нужна только для сценариев, расчет которых прерван;
+    # parallel_map опережает выдачу результатов не более чем на 2 * workers пакетов,
+    # поэтому в памяти хранится ограниченное количество сценариев
+    scenarios, pending = itertools.tee(scenarios)
+    results = parallel_map(run_scenario, scenarios, workers, chunk_size, timeout)
+    for scenario, (res, error) in zip(pending, results):
+        yield res if error is None else dict(scenario, error=error)
+
+
+def write_results(results, path: str) -> tuple:
+    """
+    Потоковая запись результатов в JSONL
+    :param results: - итератор словарей результатов
+    :param path: - путь к выходному файлу ("-" - стандартный вывод)
+    :return: (количество успешных расчетов, количество ошибок)
+    """
+    done = 0
+    failed = 0
+    stream = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+    try:
+        for res in results:
+            if 'error' in res:
+                failed += 1
+            else:
+                done += 1
+            stream.write(json.dumps(res, ensure_ascii=False, default=float) + '\n')
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return (done, failed)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m calc.batch',
+                                     description='Пакетный расчет сценариев по методикам calc')
+    parser.add_argument('input', help='файл сценариев CSV или JSONL ("-" - стандартный ввод, CSV)')
+    parser.add_argument('-o', '--output', default='-', help='файл результатов JSONL (по умолчанию стандартный вывод)')
+    parser.add_argument('-d', '--delimiter', default=',', help='разделитель полей CSV (по умолчанию ",")')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='количество процессов (по умолчанию 1, 0 - по количеству ядер)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='количество сценариев в пакете для процесса')
+    parser.add_argument('--timeout', type=float, default=None, help='ограничение времени одного сценария, с')
+    args = parser.parse_args(argv)
+
+    scenarios = read_scenarios(args.input, args.delimiter)
+    results = run_scenarios(scenarios, args.workers or None, args.chunk_size, args.timeout)
+    done, failed = write_results(results, args.output)
+    print(f'Рассчитано сценариев: {done}, с ошибкой: {failed}', file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
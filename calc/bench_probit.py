@@ -0,0 +1,60 @@
+# -----------------------------------------------------------
+# Сравнение способов вычисления вероятности поражения:
+# полиномиальная аппроксимация, функция нормального распределения
+# и интерполяция по таблице
+#
+# Запуск: python -m calc.bench_probit
+# -----------------------------------------------------------
+
+import time
+import numpy as np
+from calc.calc_probit import Probit, PROBIT_MIN, PROBIT_MAX, probability_table_error
+
+
+def throughput(func, probit: np.ndarray, repeat: int = 5) -> float:
+    """
+    Пропускная способность функции (лучшая из repeat попыток)
+    :@param func: функция вероятности поражения от массива значений пробит-функции
+    :@param probit: массив значений пробит-функции
+
+    :@return: float: количество значений в секунду
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(probit)
+        best = min(best, time.perf_counter() - start)
+    return probit.size / best
+
+
+def compare(size: int = 10 ** 6) -> dict:
+    """
+    Сравнение способов на равномерной сетке пробит-функции от 2.67 до 8.09
+    :@param size: количество значений
+
+    :@return: dict: пропускная способность (значений/с) и максимальное отклонение
+    """
+    probit = np.linspace(PROBIT_MIN, PROBIT_MAX, size)
+    polynomial = Probit('polynomial').probability_vector
+    exact = Probit('exact').probability_vector
+    table = Probit('table').probability_vector
+
+    deviation = np.abs(polynomial(probit) - exact(probit))
+
+    return {
+        'polynomial': throughput(polynomial, probit),
+        'exact': throughput(exact, probit),
+        'table': throughput(table, probit),
+        'max_deviation': float(deviation.max()),
+        'probit_at_max_deviation': float(probit[deviation.argmax()]),
+    }
+
+
+if __name__ == '__main__':
+    res = compare()
+    print(f'Полином: {res["polynomial"]:.3e} значений/с')
+    print(f'Ф(Pr - 5): {res["exact"]:.3e} значений/с')
+    print(f'Таблица: {res["table"]:.3e} значений/с')
+    print(f'Макс. отклонение: {res["max_deviation"]:.4f} при Pr = {res["probit_at_max_deviation"]:.3f}')
+    for table_size in (257, 1025, 4097, 16385):
+        print(f'Ошибка интерполяции, {table_size} узлов: {probability_table_error(table_size):.2e}')
@@ -5,7 +5,6 @@
 # (C) 2024 Kuznetsov Konstantin, Kazan , Russian Federation
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
-import matplotlib.pyplot as plt
 
 # Социально-экономический ущерб
 SPK1 = 2000_000  # страховая выплата по договору обязательного страхования гражданской ответственности ФЗ-225, руб
@@ -180,6 +179,8 @@ class Damage:
 
 
 if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+
     damage = Damage(dead_man=1, injured_man=1, volume_equipment=500, diametr_pipe=114, lenght_pipe=2.589,
                     degree_damage=1, m_out_spill=0.58, m_in_spill=3.69, S_spill=258).sum_damage()
 
@@ -8,6 +8,7 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 import math
+import numpy as np
 
 TEMP_TO_KELVIN = 273
 
@@ -49,13 +50,38 @@ class LPG_evaporation:
 
         return mass
 
+    def mass_coefficient(self):
+        """
+        Коэффициент k в зависимости m = k * sqrt(t) (не зависит от времени);
+        параметры класса могут быть массивами одной формы или приводимыми к ней
+        :@return: k, кг/с^0.5
+        """
+        strait_area = np.asarray(self.strait_area, dtype=float)
+        molar_mass = np.asarray(self.molar_mass, dtype=float)
+        first_add = strait_area * ((molar_mass / 1000) / 13440) * (
+                np.asarray(self.surface_temperature, dtype=float) - np.asarray(self.lpg_temperature, dtype=float))
+        second_add = 2 * 1.5 / math.sqrt(3.14 * 8.4 * math.pow(10, -8))
+        # площадь пролива в третьем слагаемом сокращается
+        third_add = 5.1 * math.sqrt(2.74 * math.pow(10, -2) / (1.64 * math.pow(10, -5)))
+        return first_add * (second_add + third_add)
+
+    def evaporation_curve(self, time) -> np.ndarray:
+        """
+        Масса испарившегося СУГ на произвольной сетке времени
+        :@param time: массив времени, с
+        :@return: mass: масса испарившегося СУГ, кг; форма - форма параметров класса + форма time
+        """
+        time = np.asarray(time, dtype=float)
+        k = self.mass_coefficient()
+        return k[(...,) + (None,) * time.ndim] * np.sqrt(time)
+
     def evaporation_array(self) -> tuple:
         """
         :@return: : список списков параметров
         """
 
         time_arr = [t for t in range(1, 3601)]
-        evaporatiom_arr = [self.evaporation_in_moment(t) for t in time_arr]
+        evaporatiom_arr = self.evaporation_curve(time_arr).tolist()
 
         result = (time_arr, evaporatiom_arr)
 
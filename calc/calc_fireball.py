@@ -7,8 +7,12 @@
 # -----------------------------------------------------------
 
 import math
+import numpy as np
 from calc.calc_probit import Probit
-from calc._found_nearest_value import get_nearest_value
+from calc._found_zone_radius import get_zone_radius
+from calc._result_cache import cached_result
+
+CLASSIFIED_ZONES = (600, 320, 220, 120)  # пороги дозы теплового излучения для зон, кДж/м2
 
 
 class Fireball:
@@ -29,10 +33,8 @@ class Fireball:
             raise ValueError(f'Фукнция не может принимать нулевые параметры')
 
         D_eff = 5.33 * pow(mass, 0.327)
-        print(f'D_eff= {D_eff}')
         H_eff = D_eff / 2
         t_s = 0.92 * pow(mass, 0.303)
-        print(f't_s= {t_s}')
 
         Fq = (H_eff / D_eff + 0.5) / (4 * ((((H_eff / D_eff + 0.5) ** 2) +
                                             ((radius / D_eff) ** 2)) ** 1.5))
@@ -46,6 +48,65 @@ class Fireball:
 
         return res
 
+    def fireball_vector(self, mass: float, ef: float, radius: np.ndarray) -> tuple:
+
+        """
+        Интенсивность и доза теплового излучения сразу для массива расстояний (без округления)
+        :@param mass: масса огненного шара, кг
+        :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
+        :@param radius: массив расстояний от геометрического центра шара, м
+
+        :@return: tuple: (q_term, d_term): массивы np.ndarray, кВт/м2 и кДж/м2
+        :@raise проверка функции на введенные нулевые значения
+        """
+        radius = np.asarray(radius, dtype=float)
+        # Проверки
+        if 0 in (mass, ef) or np.any(radius == 0):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
+        D_eff = 5.33 * mass ** 0.327
+        H_eff = D_eff / 2
+        t_s = 0.92 * mass ** 0.303
+
+        Fq = (H_eff / D_eff + 0.5) / (4 * ((((H_eff / D_eff + 0.5) ** 2) +
+                                            ((radius / D_eff) ** 2)) ** 1.5))
+
+        tay = np.exp(-7 * (10 ** (-4) * (np.sqrt(radius ** 2 + H_eff ** 2) - D_eff / 2)))
+
+        q_ball = ef * Fq * tay
+
+        return (q_ball, q_ball * t_s)
+
+    @cached_result
+    def fireball_profile(self, mass: float, ef: float, points: int = 200) -> tuple:
+
+        """
+        Профиль на геометрической сетке расстояний от 1 м до границы 1.2 кВт/м2
+        (points точек вместо шага 0.5 м в fireball_array)
+        :@param mass: масса огненного шара, кг
+        :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
+        :@param points: количество точек сетки
+
+        :@return tuple: (radius, q_term, d_term, probit, probability): кортеж массивов np.ndarray
+        """
+        radius_end = get_zone_radius(lambda r: self.fireball_point(mass, ef, r)[0], 1.2, 1)
+
+        if radius_end == 0:
+            empty = np.array([])
+            return (empty, empty, empty, empty, empty)
+
+        radius = np.geomspace(1, radius_end, points)
+        t_s = 0.92 * (mass ** 0.303)
+        q_term = np.round(self.fireball_vector(mass, ef, radius)[0], 2)
+        d_term = np.round(q_term * t_s, 2)
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_fireball_vector(t_s, q_term)
+        probability = probit_cls.probability_vector(probit)
+
+        return (radius, q_term, d_term, probit, probability)
+
+    @cached_result
     def fireball_array(self, mass: float, ef: float) -> tuple:
 
         """
@@ -59,8 +120,6 @@ class Fireball:
         radius_arr = []
         q_term_arr = []
         d_term_arr = []
-        probit_arr = []
-        probability_arr = []
 
         # максимальная интенсивность теплового излучения
         radius = 1
@@ -72,39 +131,38 @@ class Fireball:
             res = self.fireball_point(mass, ef, radius)
             q_term = res[0]
             d_term = res[1]
-            probit = Probit().probit_fireball(t_s, q_term)
-            probability = Probit().probability(probit)
             # append
             radius_arr.append(radius)
             q_term_arr.append(q_term)
             d_term_arr.append(d_term)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
             radius += 0.5
 
+        # расчитаем пробит функцию и вероятность поражения сразу для всего профиля
+        probit_cls = Probit()
+        probit = probit_cls.probit_fireball_vector(t_s, q_term_arr)
+        probit_arr = probit.tolist()
+        probability_arr = probit_cls.probability_vector(probit).tolist()
+
         result = (radius_arr, q_term_arr, d_term_arr, probit_arr, probability_arr)
 
         return result
 
-    def termal_class_zone(self, mass: float, ef: float) -> list:
+    @cached_result
+    def termal_class_zone(self, mass: float, ef: float, tolerance: float = 0.01) -> list:
         """
         :@param mass: масса огненного шара, кг
         :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
+        :@param tolerance: точность определения радиусов зон, м
 
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
-        res_list = self.fireball_array(mass, ef)
+        def d_term(radius):
+            return self.fireball_point(mass, ef, radius)[1]
 
         # Calculate classified_zone_array
-        classified_zone_array = [600, 320, 220, 120]  # CZA
-        radius_CZA = []
-        d_term_array = res_list[2]
-        radius_array = res_list[0]
-
-        for CZA in classified_zone_array:
-            ind = d_term_array.index(get_nearest_value(d_term_array, CZA))
-            radius_CZA.append(radius_array[ind])
+        radius_CZA = [get_zone_radius(d_term, CZA, 1, tolerance) for CZA in CLASSIFIED_ZONES]
+
         return radius_CZA
 
 
@@ -9,6 +9,7 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 import math
+import numpy as np
 
 DISCHARGE = 1  # коэф.истечения, допускается брать 0.95-1 при разрыве на сечение (p.37)
 TEMP_TO_KELVIN = 273
@@ -26,8 +27,8 @@ class Outflow:
                  mol_weight: float, poisson_ratio: float):
         '''
         Класс предназначен для расчета истечения газа
-        :param рipe_diameter: - диаметр трубы, м
-        :param pipe_length: - длина трубы, м
+        :param рipe_diameter: - диаметр трубы, м (число или массив)
+        :param pipe_length: - длина трубы, м (число или массив, приводимый к форме диаметра)
         :param pressure: - давление, МПа
         :param temperature: - температура, град.С
         :param mol_weight: - молекулярная масса, кг/кмоль
@@ -40,6 +41,14 @@ class Outflow:
         self.mol_weight = mol_weight * KMOL_TO_MOL
         self.poisson_ratio = poisson_ratio
 
+        # постоянные сценария (не зависят от времени, считаются один раз)
+        self.k_coefficient = self.coefficient_K()
+        self.square = self.cross_sectional_area()
+        self.u_s = self.u_sound()
+        self.re = self.reinolds()
+        self.f = self.fanning_factor()
+        self.t_b = self.time_base()
+        self.mass_gas = self.gas_density() * self.pipe_length * self.square  # масса газа в трубе, кг
 
     def coefficient_K(self) -> float:
         '''
@@ -68,19 +77,23 @@ class Outflow:
         :param temperature: - температура, град. K
         :return: расход, кг/с
         '''
-        square = (1 / 4) * math.pi * math.pow(self.pipe_diameter, 2)
-        k = self.coefficient_K()
+        square = self.square
+        k = self.k_coefficient
         a = DISCHARGE * square * self.pressure * MPA_TO_PA * k
         b = math.pow(math.fabs(self.mol_weight / (self.poisson_ratio * R * self.temperature)), 1 / 2)
-        return float(a * b)
+        return a * b
 
     def u_sound(self) -> float:
         'Скорость звука, м/с'
         return math.pow(self.poisson_ratio * R * self.temperature / self.mol_weight, 1 / 2)
 
+    def gas_density(self) -> float:
+        'Плотность газа в трубопроводе, кг/м3'
+        return self.pressure * MPA_TO_PA * self.mol_weight / (R * self.temperature)
+
     def reinolds(self) -> float:
         'Число Рейнольдса для истечения газа'
-        square = (1 / 4) * math.pi * math.pow(self.pipe_diameter, 2)
+        square = self.square
         po = self.pressure * MPA_TO_PA * self.mol_weight / (R * self.temperature)
         m = self.flow_rate_init()
         u = m / (po * square)
@@ -88,53 +101,88 @@ class Outflow:
         return (po * u * self.pipe_diameter / VISCOSITY) * math.pow(10, 6)
 
     def fanning_factor(self) -> float:
-        'Параметр Фаннинга'
-        re = self.reinolds()
-        if re < 2000:
-            return 16 / re
-        return 0.0791 * math.pow(re, -0.25)
+        'Параметр Фаннинга (число или массив - по размерам трубы)'
+        re = self.re
+        if np.ndim(re) == 0:
+            return 16 / re if re < 2000 else 0.0791 * re ** -0.25
+        return np.where(re < 2000, 16 / re, 0.0791 * re ** -0.25)
 
     def time_base(self) -> float:
         'Определение времени истечения, с'
-        us = self.u_sound()
-        f = self.fanning_factor()
+        us = self.u_s
+        f = self.f
         a = (4 / 3) * (self.pipe_length / us)
-        b = math.pow(self.poisson_ratio * f * self.pipe_length / self.pipe_diameter, 1 / 2)
+        b = (self.poisson_ratio * f * self.pipe_length / self.pipe_diameter) ** (1 / 2)
         tb = a * b
         return tb
 
     def cross_sectional_area(self) -> float:
         'Площадь отверстия истечения, м2'
-        return (1 / 4) * math.pi * math.pow(self.pipe_diameter, 2)
+        return (1 / 4) * math.pi * self.pipe_diameter ** 2
 
     def mass_flow_rate_init(self) -> float:
         'Определение мгновенного массового расхода при t = 0 сек'
-        s = self.cross_sectional_area()
-        k = self.coefficient_K()
+        s = self.square
+        k = self.k_coefficient
         m = DISCHARGE * s * self.pressure * MPA_TO_PA * k * math.pow(
             self.mol_weight / (self.poisson_ratio * R * self.temperature), 1 / 2)
         return m
 
+    def flow_rate_vector(self, time: np.ndarray, m: float = None) -> np.ndarray:
+        '''
+        Расход по времени (двойная экспоненциальная зависимость) для массива времени
+        :param time: - массив времени, с
+        :param m: - начальный расход, кг/с (None - mass_flow_rate_init без округления)
+        :return: массив расхода, кг/с
+        '''
+        if m is None:
+            m = self.mass_flow_rate_init()
+        tb = self.t_b
+        S = self.mass_gas / (m * tb)
+        time = np.asarray(time, dtype=float)
+        return m / (1 + S) * (S * np.exp(-time / tb) + np.exp(-time / (tb * S * S)))
+
+    def time_series(self, step: float = 1, time_end: float = None) -> tuple:
+        '''
+        Расход по времени на сетке с произвольным шагом (без округления)
+        :param step: - шаг по времени, с
+        :param time_end: - конечное время, с (None - время прохождения звука по трубе)
+        :return: (time, mass_flow_rate): массивы времени, с и расхода, кг/с
+        '''
+        if time_end is None:
+            time_end = self.pipe_length / self.u_s
+        time = np.arange(0, time_end + step / 2, step)
+        return (time, self.flow_rate_vector(time))
+
     def result(self):
         'Определение расхода по времени от t = 0 сек до t = time_valid'
-        m = round(self.mass_flow_rate_init(),2)
-        tb =self.time_base()
-        s = self.cross_sectional_area()
-        po = self.pressure * MPA_TO_PA * self.mol_weight / (R * self.temperature)
-        mass_gas = po*self.pipe_length*s
-        S = mass_gas/(m*tb)
-        u_s = self.u_sound()
-        time_valid = int(self.pipe_length / u_s)
-
-        mass_flow_rate = [m]
-        time = [0]
-        for t in range(0,time_valid,1):
-            a = m/(1+S)
-            b = S* math.exp(-t/tb)
-            c = math.exp(-t/(tb*math.pow(S,2)))
-            mass_flow_rate.append(round(a*(b+c)))
-            time.append(t)
-        return(time, mass_flow_rate)
+        m = round(self.mass_flow_rate_init(), 2)
+        time_valid = int(self.pipe_length / self.u_s)
+
+        flow = self.flow_rate_vector(np.arange(time_valid), m)
+        mass_flow_rate = [m] + np.rint(flow).astype(int).tolist()
+        time = [0] + list(range(time_valid))
+        return (time, mass_flow_rate)
+
+
+def sweep(pipe_diameter, pipe_length, pressure: float, temperature: float, mol_weight: float,
+          poisson_ratio: float, time) -> np.ndarray:
+    '''
+    Расход по времени для всех сочетаний диаметров и длин трубопровода (векторно)
+    :param pipe_diameter: - массив диаметров трубы, м
+    :param pipe_length: - массив длин трубы, м
+    :param pressure: - давление, МПа
+    :param temperature: - температура, град.С
+    :param mol_weight: - молекулярная масса, кг/кмоль
+    :param poisson_ratio: - адиабата газа, -
+    :param time: - массив времени, с
+    :return: массив расхода, кг/с (диаметр, длина, время)
+    '''
+    # методы Outflow работают с массивами размеров трубы (диаметр, длина, 1)
+    diameter = np.asarray(pipe_diameter, dtype=float)[:, None, None]
+    length = np.asarray(pipe_length, dtype=float)[None, :, None]
+    time = np.asarray(time, dtype=float)[None, None, :]
+    return Outflow(diameter, length, pressure, temperature, mol_weight, poisson_ratio).flow_rate_vector(time)
 
 if __name__ == '__main__':
     cls = Outflow(pipe_diameter=1, pipe_length=10000, pressure=0.5, temperature=15,
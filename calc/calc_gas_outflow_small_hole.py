@@ -10,6 +10,8 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 import math
+import numpy as np
+from scipy.integrate import solve_ivp
 
 TEMP_TO_KELVIN = 273
 TEMP_TO_C = -273
@@ -21,6 +23,9 @@ MPA_TO_PA = math.pow(10, 6)  # МПа в Па
 PA_TO_MPA = math.pow(10, -6)  # Па в МПа
 CP = 0.01  # теплоемкость при постоянном объеме
 MM_TO_M = 0.001
+PRESSURE_MIN = 0.07  # давление, до которого ведется расчет, МПа
+WEIGHT_MIN = 30  # масса газа, до которой ведется расчет, кг
+TIME_MAX = 86400  # ограничение времени расчета с адаптивным шагом, с
 
 
 class Outflow:
@@ -155,6 +160,78 @@ class Outflow:
         temperature = [round(i + TEMP_TO_C, 0) for i in temperature]
         return (weight, time, temperature, density_gas, pressure, mass_flow_rate, delta_density, delta_temperature)
 
+    def derivatives(self, t: float, state: tuple) -> tuple:
+        '''
+        Правая часть системы истечения (та же модель, что в result, без округлений)
+        :param t: - время, с
+        :param state: - (масса газа кг, плотность газа кг/м3, температура газа K)
+        :return: (dm/dt, d(плотность)/dt, dT/dt)
+        '''
+        weight, density, temperature = state
+        pressure = R * temperature * (density / self.mol_weight) * PA_TO_MPA
+        flow = self.flow_rate_init(pressure, temperature)
+        d_density = -flow / self.volume
+        d_temperature = (self.pressure / (math.pow(self.density(), 2) * CP)) * d_density
+        return (-flow, d_density, d_temperature)
+
+    def result_adaptive(self, time_grid=None, time_max: float = TIME_MAX, rtol: float = 1e-6):
+        '''
+        Истечение с интегрированием по времени методом Рунге-Кутты 5(4) с автоматическим шагом
+        (scipy.integrate.solve_ivp; масса, плотность и температура без округления на каждом шаге). Расчет останавливается
+        при давлении < PRESSURE_MIN, массе < WEIGHT_MIN или массе меньше начального расхода за 1 с,
+        ограничение по времени - time_max
+
+        :param time_grid: - сетка времени для вывода, с (None - через 1 с до окончания расчета);
+                            узлы после окончания расчета отбрасываются, момент окончания добавляется
+        :param time_max: - ограничение времени расчета, с
+        :param rtol: - относительная погрешность шага
+        :return: кортеж списков, как в result:
+        (weight, time, temperature, density_gas, pressure, mass_flow_rate, delta_density, delta_temperature)
+        '''
+        density = self.density()
+        weight = self.volume * density
+        flow_init = self.flow_rate_init(self.pressure, self.temperature)
+
+        def pressure_event(t, state):
+            return R * state[2] * (state[1] / self.mol_weight) * PA_TO_MPA - PRESSURE_MIN
+
+        def weight_event(t, state):
+            return state[0] - max(WEIGHT_MIN, flow_init)
+
+        events = (pressure_event, weight_event)
+        for event in events:
+            event.terminal = True
+            event.direction = -1
+
+        state_init = (weight, density, self.temperature)
+        if any(event(0, state_init) <= 0 for event in events):
+            solution = None
+            time_end = 0
+        else:
+            solution = solve_ivp(self.derivatives, (0, time_max), state_init, method='RK45', events=events,
+                                 dense_output=True, rtol=rtol, atol=1e-9)
+            time_end = solution.t[-1]
+
+        if time_grid is None:
+            time_grid = range(0, int(time_end) + 1)
+        time_grid = [t for t in time_grid if t <= time_end]
+        if not time_grid or time_grid[-1] < time_end:
+            time_grid.append(time_end)
+
+        if solution is not None:
+            states = solution.sol(time_grid).T
+        else:
+            states = np.tile(state_init, (len(time_grid), 1))
+
+        res = ([], [], [], [], [], [], [], [])
+        for t, state in zip(time_grid, states.tolist()):
+            d_weight, d_density, d_temperature = self.derivatives(t, state)
+            pressure = R * state[2] * (state[1] / self.mol_weight) * PA_TO_MPA
+            for item, value in zip(res, (state[0], t, state[2] + TEMP_TO_C, state[1], pressure,
+                                         -d_weight, d_density, d_temperature)):
+                item.append(value)
+        return res
+
 
 if __name__ == '__main__':
     cls = Outflow(volume=50, pressure=5, temperature=15,
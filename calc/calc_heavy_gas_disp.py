@@ -10,10 +10,122 @@
 # -----------------------------------------------------------
 
 import math
+import numpy as np
+from calc.calc_probit import Probit
 
 GRAVITY = 9.81  # ускорение свободного падения м/с2
 KGM3_TO_MGLITER = 1000  # кг/м3 в мг/л
 
+# Britter and McQuaid diagram - апроксимация: для каждого отношения концентраций C/C0
+# отрезки (alpha_max, k, b): beta = k * alpha + b при alpha <= alpha_max
+# Figure C5.20 (мгновенный выброс)
+INSTANTANEOUS_BETA = {
+    0.1: ((-0.44, 0, 0.7), (0.43, 0.26, 0.81), (math.inf, 0, 0.93)),
+    0.05: ((-0.56, 0, 0.85), (0.31, 0.26, 1), (math.inf, -0.12, 1.12)),
+    0.02: ((-0.66, 0, 0.95), (0.32, 0.36, 1.19), (math.inf, -0.26, 1.38)),
+    0.01: ((-0.71, 0, 1.15), (0.37, 0.34, 1.39), (math.inf, -0.38, 1.66)),
+    0.005: ((-0.52, 0, 1.48), (0.24, 0.26, 1.62), (math.inf, -0.30, 1.75)),
+    0.002: ((0.27, 0, 1.83), (math.inf, -0.32, 1.92)),
+    0.001: ((-0.1, 0, 2.075), (math.inf, -0.27, 2.05)),
+}
+# Figure C5.17 (непрерывный выброс)
+CONTINUOUS_BETA = {
+    0.1: ((-0.55, 0, 1.75), (-0.14, 0.24, 1.88), (math.inf, 0.5, 1.78)),
+    0.05: ((-0.68, 0, 1.92), (-0.29, 0.36, 2.16), (-0.18, 0, 2.06), (math.inf, 0.56, 1.96)),
+    0.02: ((-0.69, 0, 2.08), (-0.31, 0.45, 2.39), (-0.16, 0, 2.25), (math.inf, 0.54, 2.16)),
+    0.01: ((-0.70, 0, 2.25), (-0.29, 0.49, 2.59), (-0.20, 0, 2.45), (math.inf, 0.52, 2.35)),
+    0.005: ((-0.67, 0, 2.4), (-0.28, 0.59, 2.80), (-0.15, 0, 2.63), (math.inf, 0.49, 2.56)),
+    0.002: ((-0.69, 0, 2.6), (-0.25, 0.39, 2.87), (-0.13, 0, 2.77), (math.inf, 0.50, 2.71)),
+}
+
+
+def beta_table(segments: dict) -> tuple:
+    """
+    Перевод отрезков апроксимации в массивы (по возрастанию отношения концентраций)
+    :param segments: - словарь {C/C0: ((alpha_max, k, b), ...)}
+    :return: (ratio, alpha_max, k, b): массив отношений концентраций (n,) и массивы отрезков (n, m)
+    """
+    ratio = np.array(sorted(segments))
+    size = max(len(item) for item in segments.values())
+    # недостающие отрезки дополняются последним (alpha_max = inf)
+    rows = [segments[key] + segments[key][-1:] * (size - len(segments[key])) for key in ratio]
+    table = np.array(rows, dtype=float)
+    return (ratio, table[:, :, 0], table[:, :, 1], table[:, :, 2])
+
+
+def beta_levels(table: tuple, alpha_aprox: float) -> np.ndarray:
+    """
+    Значения бета-параметра для всех табличных отношений концентраций
+    :param table: - массивы отрезков (beta_table)
+    :param alpha_aprox: - параметр для апроксимации графика (альфа-параметр)
+    :return: beta_aprox: np.ndarray (n,) по возрастанию отношения концентраций
+    """
+    ratio, alpha_max, slope, intercept = table
+    rows = np.arange(ratio.size)
+    index = (alpha_aprox > alpha_max).sum(axis=1)
+    return slope[rows, index] * alpha_aprox + intercept[rows, index]
+
+
+def beta_interpolated(table: tuple, alpha_aprox: float, concentration) -> np.ndarray:
+    """
+    Бета-параметр для произвольного отношения концентраций: линейная интерполяция
+    по lg(C/C0) между табличными кривыми (за пределами таблицы - крайняя кривая)
+    :param table: - массивы отрезков (beta_table)
+    :param alpha_aprox: - параметр для апроксимации графика (альфа-параметр)
+    :param concentration: - отношение концентраций C/C0 (число или np.ndarray)
+    :return: beta_aprox: np.ndarray
+    """
+    ratio = table[0]
+    return np.interp(np.log10(concentration), np.log10(ratio), beta_levels(table, alpha_aprox))
+
+
+def ratio_at_distance(ratio: np.ndarray, x_levels: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    """
+    Отношение концентраций на расстояниях distance: интерполяция lg(C/C0) по lg(x)
+    между табличными расстояниями. Ближе первого табличного расстояния - экстраполяция
+    первого отрезка в координатах lg-lg с ограничением C/C0 <= 1 (при вырожденном
+    первом отрезке - 1), дальше последнего - 0
+    :param ratio: - табличные отношения концентраций по возрастанию
+    :param x_levels: - расстояния, на которых они достигаются, м
+    :param distance: - сетка расстояний, м
+    :return: np.ndarray: отношение концентраций C/C0
+    """
+    # расстояния убывают с ростом концентрации, для интерполяции нужен рост аргумента
+    x_levels = np.maximum.accumulate(x_levels[::-1])
+    log_ratio = np.log10(ratio[::-1])
+    log_x = np.log10(x_levels)
+    distance = np.asarray(distance, dtype=float)
+    log_distance = np.log10(np.maximum(distance, 1e-12))
+    res = 10 ** np.interp(log_distance, log_x, log_ratio)
+
+    # у источника: продолжение первого отрезка до C/C0 = 1 (консервативно)
+    near = distance < x_levels[0]
+    if near.any():
+        if log_x[1] > log_x[0] and log_ratio[1] < log_ratio[0]:
+            slope = (log_ratio[1] - log_ratio[0]) / (log_x[1] - log_x[0])
+            near_ratio = 10 ** np.minimum(log_ratio[0] + slope * (log_distance - log_x[0]), 0)
+        else:
+            near_ratio = 1
+        res = np.where(near, near_ratio, res)
+    return np.where(distance > x_levels[-1], 0, res)
+
+
+def toxic_effect(concentration, substance: str, exposure_time: float) -> tuple:
+    """
+    Пробит-функция и вероятность поражения для массива концентраций
+    :param concentration: - массив концентраций, кг/м3
+    :param substance: - вещество (см. calc_probit.TOXIC_SUBSTANCES)
+    :param exposure_time: - время экспозиции, мин
+    :return: (probit, probability): кортеж массивов np.ndarray
+    """
+    if exposure_time is None:
+        raise ValueError('Для расчета вероятности поражения нужно время экспозиции')
+    return Probit().toxic_vector(substance, exposure_time, np.asarray(concentration, dtype=float) * KGM3_TO_MGLITER)
+
+
+INSTANTANEOUS_TABLE = beta_table(INSTANTANEOUS_BETA)
+CONTINUOUS_TABLE = beta_table(CONTINUOUS_BETA)
+
 
 class Instantaneous_source:
     def __init__(self, wind_speed: float, density_air: float, density_init: float, volume_gas: float):
@@ -45,80 +157,11 @@ class Instantaneous_source:
         '''
         Britter and McQuaid diagram - апроксимация
         :param alpha_aprox: - параметр для апроксимации графика (альфа-параметр)
-        :param concentration: - концентрация, кг/м3
+        :param concentration: - отношение концентраций C/C0 (между табличными значениями - интерполяция)
         :return: beta_aprox - параметр для апроксимации графика (бета-параметр)
         Figure C5.20. Britter and McQuaid diagram [Britter & McQuaid 1988]
         '''
-        if concentration == 0.1:
-            if alpha_aprox <= -0.44:
-                beta_aprox = 0.7
-            elif alpha_aprox > -0.44 and alpha_aprox <= 0.43:
-                beta_aprox = 0.26 * alpha_aprox + 0.81
-            elif alpha_aprox > 0.43 and alpha_aprox <= 1:
-                beta_aprox = 0.93
-            else:
-                beta_aprox = 0.93
-
-        elif concentration == 0.05:
-            if alpha_aprox <= -0.56:
-                beta_aprox = 0.85
-            elif alpha_aprox > -0.56 and alpha_aprox <= 0.31:
-                beta_aprox = 0.26 * alpha_aprox + 1
-            elif alpha_aprox > 0.31 and alpha_aprox <= 1:
-                beta_aprox = -0.12 * alpha_aprox + 1.12
-            else:
-                beta_aprox = -0.12 * alpha_aprox + 1.12
-
-        elif concentration == 0.02:
-            if alpha_aprox <= -0.66:
-                beta_aprox = 0.95
-            elif alpha_aprox > -0.66 and alpha_aprox <= 0.32:
-                beta_aprox = 0.36 * alpha_aprox + 1.19
-            elif alpha_aprox > 0.32 and alpha_aprox <= 1:
-                beta_aprox = -0.26 * alpha_aprox + 1.38
-            else:
-                beta_aprox = -0.26 * alpha_aprox + 1.38
-
-        elif concentration == 0.01:
-            if alpha_aprox <= -0.71:
-                beta_aprox = 1.15
-            elif alpha_aprox > -0.71 and alpha_aprox <= 0.37:
-                beta_aprox = 0.34 * alpha_aprox + 1.39
-            elif alpha_aprox > 0.37 and alpha_aprox <= 1:
-                beta_aprox = -0.38 * alpha_aprox + 1.66
-            else:
-                beta_aprox = -0.38 * alpha_aprox + 1.66
-
-        elif concentration == 0.005:
-            if alpha_aprox <= -0.52:
-                beta_aprox = 1.48
-            elif alpha_aprox > -0.52 and alpha_aprox <= 0.24:
-                beta_aprox = 0.26 * alpha_aprox + 1.62
-            elif alpha_aprox > 0.24 and alpha_aprox <= 1:
-                beta_aprox = -0.30 * alpha_aprox + 1.75
-            else:
-                beta_aprox = -0.30 * alpha_aprox + 1.75
-
-        elif concentration == 0.002:
-            if alpha_aprox <= 0.27:
-                beta_aprox = 1.83
-            elif alpha_aprox > 0.27 and alpha_aprox <= 1:
-                beta_aprox = -0.32 * alpha_aprox + 1.92
-            else:
-                beta_aprox = -0.32 * alpha_aprox + 1.92
-
-        elif concentration == 0.001:
-            if alpha_aprox <= -0.1:
-                beta_aprox = 2.075
-            elif alpha_aprox > 0.1 and alpha_aprox <= 1:
-                beta_aprox = -0.27 * alpha_aprox + 2.05
-            else:
-                beta_aprox = -0.27 * alpha_aprox + 2.05
-
-        else:
-            beta_aprox = -0.27 * alpha_aprox + 2.05
-
-        return beta_aprox
+        return float(beta_interpolated(INSTANTANEOUS_TABLE, alpha_aprox, concentration))
 
     def find_distance(self, beta_aprox: float) -> float:
         '''
@@ -129,20 +172,47 @@ class Instantaneous_source:
         x_dist = math.pow(10, beta_aprox) * math.pow(self.volume_gas, 1 / 3)
         return x_dist
 
+    def find_distance_vector(self, beta_aprox: np.ndarray) -> np.ndarray:
+        '''
+        Расстояния для массива бета-параметров
+        :param beta_aprox: - параметры для апроксимации графика (бета-параметр)
+        :return: x_dist - расстояния, м
+        '''
+        return np.power(10, beta_aprox) * math.pow(self.volume_gas, 1 / 3)
+
     def find_time(self, x_dist: float):
         '''
 
         :param x_dist: - расстояние, м
         :return: (time, b_param) - время, с и ширина облака, м
         '''
+        time, width = self.find_time_vector(x_dist)
+        return (float(time), float(width))
+
+    def find_time_vector(self, x_dist) -> tuple:
+        '''
+        Время подхода облака на расстояние x_dist: пересечение радиуса облака
+        sqrt(D^2 + 1.2*t*sqrt(g0*V)) с x_dist - 0.4*u*t.
+        После возведения в квадрат это квадратное уравнение относительно t
+        (0.4u)^2*t^2 - (2*x*0.4u + 1.2*sqrt(g0*V))*t + x^2 - D^2 = 0,
+        берется меньший корень (при нем x_dist - 0.4*u*t >= 0)
+
+        :param x_dist: - расстояние, м (число или np.ndarray)
+        :return: (time, b_param) - массивы времени, с и ширины облака, м
+        '''
+        x_dist = np.asarray(x_dist, dtype=float)
         diametr_cloud = math.pow(self.volume_gas / math.pi, 1 / 3)
         g0 = (GRAVITY * (self.density_init - self.density_air)) / self.density_air
-        time = 0
-        while True:
-            if math.fabs((math.sqrt(diametr_cloud * diametr_cloud + 1.2 * time * math.sqrt(g0 * self.volume_gas))) - (
-                    x_dist - 0.4 * self.wind_speed * time)) < 0.1:
-                return (time, x_dist - 0.4 * self.wind_speed * time)
-            time += 0.01
+        spread = 1.2 * math.sqrt(g0 * self.volume_gas)  # скорость роста квадрата радиуса облака, м2/с
+        drift = 0.4 * self.wind_speed  # скорость сноса облака, м/с
+
+        # меньший корень в устойчивой форме 2c/(b + sqrt(b^2 - 4ac)), без вычитания близких чисел
+        b_coef = 2 * x_dist * drift + spread
+        discriminant = spread * spread + 4 * x_dist * drift * spread + 4 * drift * drift * diametr_cloud * diametr_cloud
+        time = 2 * (x_dist * x_dist - diametr_cloud * diametr_cloud) / (b_coef + np.sqrt(discriminant))
+        # расстояние внутри начального облака - облако уже там
+        time = np.where(x_dist <= diametr_cloud, 0, time)
+        return (time, x_dist - drift * time)
 
     def concentration(self):
         '''
@@ -162,13 +232,12 @@ class Instantaneous_source:
 
         limit_concentration = (0.1, 0.05, 0.02, 0.01, 0.005, 0.002, 0.001)
 
+        alpha = self.alpha()
         for item_concentration in limit_concentration:
-            alpha = self.alpha()
             beta = self.beta(alpha, item_concentration)
             x_dist = self.find_distance(beta)
             conc_in_dist = self.density_init * item_concentration
             time_arr = self.find_time(x_dist)
-            print('item_concentration')
             time_cloud = time_arr[0]
             b_eq = time_arr[1]
 
@@ -187,9 +256,43 @@ class Instantaneous_source:
         dose = ((2 * math.pow(2 * math.pi, 2)) / self.wind_speed) * concentration * 16.67
         return dose
 
-    def result(self):
+    def concentration_profile(self, distance, substance: str = None, exposure_time: float = None) -> tuple:
+        '''
+        Профиль концентрации на произвольной сетке расстояний (векторно):
+        бета-параметр интерполируется между кривыми Britter and McQuaid diagram
+
+        :param distance: - сетка расстояний, м (np.ndarray)
+        :param substance: - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time: - время экспозиции, мин (обязательно, если задано вещество)
+        :return: (concentration, dose, width, time) - массивы np.ndarray
+        концентрации кг/м3 (дальше последней табличной кривой - 0);
+        токсодоза, мг*мин/л;
+        ширина облака, м;
+        время подхода облака, с;
+        если задано вещество - дополнительно (probit, probability)
+        '''
+        distance = np.asarray(distance, dtype=float)
+        beta = beta_levels(INSTANTANEOUS_TABLE, self.alpha())
+        x_levels = self.find_distance_vector(beta)
+        concentration = self.density_init * ratio_at_distance(INSTANTANEOUS_TABLE[0], x_levels, distance)
+        time, width = self.find_time_vector(distance)
+        res = (concentration, self.toxic_dose(concentration), width, time)
+        if substance is None:
+            return res
+        return res + toxic_effect(concentration, substance, exposure_time)
+
+    def result(self, substance: str = None, exposure_time: float = None):
+        '''
+        :param substance: - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time: - время экспозиции, мин (обязательно, если задано вещество)
+        :return: [dose, concentration, x_dist, width, time],
+        если задано вещество - дополнительно списки probit, probability
+        '''
         data = self.concentration()
-        return [[self.toxic_dose(i) for i in data[0]], data[0], data[1], data[2], data[3]]
+        res = [[self.toxic_dose(i) for i in data[0]], data[0], data[1], data[2], data[3]]
+        if substance is not None:
+            res.extend(item.tolist() for item in toxic_effect(data[0], substance, exposure_time))
+        return res
 
 
 class Continuous_source:
@@ -226,84 +329,11 @@ class Continuous_source:
         '''
         Britter and McQuaid diagram - апроксимация
         :param alpha_aprox: - параметр для апроксимации графика (альфа-параметр)
-        :param concentration: - концентрация, кг/м3
+        :param concentration: - отношение концентраций C/C0 (между табличными значениями - интерполяция)
         :return: beta_aprox - параметр для апроксимации графика (бета-параметр)
         Figure C5.17. Britter and McQuaid diagram [Britter & McQuaid 1988].
         '''
-        if concentration == 0.1:
-            if alpha_aprox <= -0.55:
-                beta_aprox = 1.75
-            elif alpha_aprox > -0.55 and alpha_aprox <= -0.14:
-                beta_aprox = 0.24 * alpha_aprox + 1.88
-            elif alpha_aprox > -0.14 and alpha_aprox <= 1:
-                beta_aprox = 0.5 * alpha_aprox + 1.78
-            else:
-                beta_aprox = 0.5 * alpha_aprox + 1.78
-
-        elif concentration == 0.05:
-            if alpha_aprox <= -0.68:
-                beta_aprox = 1.92
-            elif alpha_aprox > -0.68 and alpha_aprox <= -0.29:
-                beta_aprox = 0.36 * alpha_aprox + 2.16
-            elif alpha_aprox > -0.29 and alpha_aprox <= -0.18:
-                beta_aprox = 2.06
-            elif alpha_aprox > -0.18 and alpha_aprox <= 1:
-                beta_aprox = 0.56 * alpha_aprox + 1.96
-            else:
-                beta_aprox = 0.56 * alpha_aprox + 1.96
-
-        elif concentration == 0.02:
-            if alpha_aprox <= -0.69:
-                beta_aprox = 2.08
-            elif alpha_aprox > -0.69 and alpha_aprox <= -0.31:
-                beta_aprox = 0.45 * alpha_aprox + 2.39
-            elif alpha_aprox > -0.31 and alpha_aprox <= -0.16:
-                beta_aprox = 2.25
-            elif alpha_aprox > -0.16 and alpha_aprox <= 1:
-                beta_aprox = 0.54 * alpha_aprox + 2.16
-            else:
-                beta_aprox = 0.54 * alpha_aprox + 2.16
-
-        elif concentration == 0.01:
-            if alpha_aprox <= -0.70:
-                beta_aprox = 2.25
-            elif alpha_aprox > -0.70 and alpha_aprox <= -0.29:
-                beta_aprox = 0.49 * alpha_aprox + 2.59
-            elif alpha_aprox > -0.29 and alpha_aprox <= -0.20:
-                beta_aprox = 2.45
-            elif alpha_aprox > -0.20 and alpha_aprox <= 1:
-                beta_aprox = 0.52 * alpha_aprox + 2.35
-            else:
-                beta_aprox = 0.52 * alpha_aprox + 2.35
-
-        elif concentration == 0.005:
-            if alpha_aprox <= -0.67:
-                beta_aprox = 2.4
-            elif alpha_aprox > -0.67 and alpha_aprox <= -0.28:
-                beta_aprox = 0.59 * alpha_aprox + 2.80
-            elif alpha_aprox > -0.28 and alpha_aprox <= -0.15:
-                beta_aprox = 2.63
-            elif alpha_aprox > -0.15 and alpha_aprox <= 1:
-                beta_aprox = 0.49 * alpha_aprox + 2.56
-            else:
-                beta_aprox = 0.49 * alpha_aprox + 2.56
-
-        elif concentration == 0.002:
-            if alpha_aprox <= -0.69:
-                beta_aprox = 2.6
-            elif alpha_aprox > -0.69 and alpha_aprox <= -0.25:
-                beta_aprox = 0.39 * alpha_aprox + 2.87
-            elif alpha_aprox > -0.25 and alpha_aprox <= -0.13:
-                beta_aprox = 2.77
-            elif alpha_aprox > -0.13 and alpha_aprox <= 1:
-                beta_aprox = 0.50 * alpha_aprox + 2.71
-            else:
-                beta_aprox = 0.50 * alpha_aprox + 2.71
-
-        else:
-            beta_aprox = 0.50 * alpha_aprox + 2.71
-
-        return beta_aprox
+        return float(beta_interpolated(CONTINUOUS_TABLE, alpha_aprox, concentration))
 
     def find_distance(self, beta_aprox: float) -> float:
         '''
@@ -315,6 +345,26 @@ class Continuous_source:
         x_dist = math.pow(10, beta_aprox) * math.pow(volumetric_consumption_gas / self.wind_speed, 0.5)
         return x_dist
 
+    def find_distance_vector(self, beta_aprox: np.ndarray) -> np.ndarray:
+        '''
+        Расстояния для массива бета-параметров
+        :param beta_aprox: - параметры для апроксимации графика (бета-параметр)
+        :return: x_dist - расстояния, м
+        '''
+        volumetric_consumption_gas = self.gas_flow / self.density_init
+        return np.power(10, beta_aprox) * math.pow(volumetric_consumption_gas / self.wind_speed, 0.5)
+
+    def plume_width(self, x_dist):
+        '''
+        Ширина шлейфа
+        :param x_dist: - расстояние, м (число или np.ndarray)
+        :return: widht_plume - ширина шлейфа, м
+        '''
+        volumetric_consumption_gas = self.gas_flow / self.density_init
+        g0 = (GRAVITY * (self.density_init - self.density_air)) / self.density_air
+        l_b = g0 * volumetric_consumption_gas / math.pow(self.wind_speed, 3)
+        return 2 * self.radius_flow + 8 * l_b + 2.5 * math.pow(l_b, 1 / 3) * x_dist ** (2 / 3)
+
     def concentration(self):
         '''
         :return: (data_concentration, data_x_dist, data_width, data_time)
@@ -327,18 +377,14 @@ class Continuous_source:
         data_x_dist = []
         data_width = []
 
-        volumetric_consumption_gas = self.gas_flow / self.density_init
-
         limit_concentration = (0.1, 0.05, 0.02, 0.01, 0.005, 0.002)
 
+        alpha = self.alpha()
         for item_concentration in limit_concentration:
-            g0 = (GRAVITY * (self.density_init - self.density_air)) / self.density_air
-            alpha = self.alpha()
             beta = self.beta(alpha, item_concentration)
             x_dist = self.find_distance(beta)
             conc_in_dist = self.density_init * item_concentration
-            l_b = g0 * volumetric_consumption_gas / math.pow(self.wind_speed, 3)
-            widht_plume = 2 * self.radius_flow + 8 * l_b + 2.5 * math.pow(l_b, 1 / 3) * math.pow(x_dist, 2 / 3)
+            widht_plume = float(self.plume_width(x_dist))
 
             data_concentration.append(conc_in_dist)
             data_x_dist.append(x_dist)
@@ -354,9 +400,41 @@ class Continuous_source:
         dose = ((2 * math.pow(2 * math.pi, 2)) / self.wind_speed) * concentration * 16.67
         return dose
 
-    def result(self):
+    def concentration_profile(self, distance, substance: str = None, exposure_time: float = None) -> tuple:
+        '''
+        Профиль концентрации на произвольной сетке расстояний (векторно):
+        бета-параметр интерполируется между кривыми Britter and McQuaid diagram
+
+        :param distance: - сетка расстояний, м (np.ndarray)
+        :param substance: - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time: - время экспозиции, мин (обязательно, если задано вещество)
+        :return: (concentration, dose, width) - массивы np.ndarray
+        концентрации кг/м3 (дальше последней табличной кривой - 0);
+        токсодоза, мг*мин/л;
+        ширина шлейфа, м;
+        если задано вещество - дополнительно (probit, probability)
+        '''
+        distance = np.asarray(distance, dtype=float)
+        beta = beta_levels(CONTINUOUS_TABLE, self.alpha())
+        x_levels = self.find_distance_vector(beta)
+        concentration = self.density_init * ratio_at_distance(CONTINUOUS_TABLE[0], x_levels, distance)
+        res = (concentration, self.toxic_dose(concentration), self.plume_width(distance))
+        if substance is None:
+            return res
+        return res + toxic_effect(concentration, substance, exposure_time)
+
+    def result(self, substance: str = None, exposure_time: float = None):
+        '''
+        :param substance: - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time: - время экспозиции, мин (обязательно, если задано вещество)
+        :return: [dose, concentration, x_dist, width],
+        если задано вещество - дополнительно списки probit, probability
+        '''
         data = self.concentration()
-        return [[self.toxic_dose(i) for i in data[0]], data[0], data[1], data[2]]
+        res = [[self.toxic_dose(i) for i in data[0]], data[0], data[1], data[2]]
+        if substance is not None:
+            res.extend(item.tolist() for item in toxic_effect(data[0], substance, exposure_time))
+        return res
 
 
 if __name__ == '__main__':
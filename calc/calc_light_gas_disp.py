@@ -11,7 +11,30 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 
+import copy
 import math
+import numpy as np
+from calc.calc_probit import Probit
+
+RESULT_DISTANCE = 10000  # предельное расстояние расчета result, м
+DOSE_LIMIT = 0.1  # токсодоза, до которой ведется расчет, мг*мин/л
+SIGMA_Z_MAX = {'A': 640, 'B': 640, 'C': 400, 'D': 400}  # ограничение sigma_z, м (табл 5 Токси 2, E и F - 220)
+FIELD_CHUNK = 256  # количество строк поля концентраций, считаемых за один векторный проход
+PASQUILL_CLASSES = ('A', 'B', 'C', 'D', 'E', 'F')  # классы стабильности атмосферы по Паскуиллу
+KGM3_TO_MGLITER = 1000  # кг/м3 в мг/л
+
+
+def field_array(shape: tuple, path: str = None) -> np.ndarray:
+    '''
+    Массив float32 для поля концентраций: в памяти или файл .npy, отображаемый в память
+    (открывается затем np.load(path, mmap_mode='r'))
+    :param shape - размер массива
+    :param path - путь к файлу .npy (None - массив в памяти)
+    :return: np.ndarray или np.memmap
+    '''
+    if path is None:
+        return np.empty(shape, dtype=np.float32)
+    return np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=shape)
 
 
 class Source:
@@ -51,7 +74,10 @@ class Source:
         self.gas_density = self.molecular_weight / (22.413 * (1 + 0.00367 * self.gas_temperature))  # НПБ 105-03
         self.pasquill = self.pasquill_atmospheric_stability_classes()
         self.radius_first_cloud = math.pow((3 / (4 * math.pi)) * (self.gas_weight / self.gas_density), 1 / 3)
-
+        # коэффициенты не зависят от расстояния, подбираются один раз на сценарий
+        self.stability = self.stability_coefficients()
+        self.roughness = self.roughness_coefficients()
+        self.sigma_z_max = SIGMA_Z_MAX.get(self.pasquill, 220)
 
     def pasquill_atmospheric_stability_classes(self) -> str:
         """
@@ -125,6 +151,21 @@ class Source:
         else:
             return coefficients[1]
 
+    def with_stability(self, pasquill: str) -> 'Source':
+        '''
+        Копия источника с заданным классом стабильности атмосферы
+        (класс задается напрямую, без подбора по облачности и времени суток)
+        :param pasquill - класс стабильности атмосферы ('A'...'F')
+        :return: Source
+        '''
+        if pasquill not in PASQUILL_CLASSES:
+            raise ValueError(f'Неизвестный класс стабильности атмосферы: {pasquill}')
+        res = copy.copy(self)
+        res.pasquill = pasquill
+        res.stability = res.stability_coefficients()
+        res.sigma_z_max = SIGMA_Z_MAX.get(pasquill, 220)
+        return res
+
     def dispersion_param(self, x_dist: int):
         '''
         Функция параметров дисперсии
@@ -135,15 +176,10 @@ class Source:
         def __sigma_z_chek(g_x, f_z):
             'Проверка параметра sigma_z по условию табл 5 Токси 2'
             result = g_x * f_z
-            if self.pasquill in ('A', 'B'):
-                return result if result < 640 else 640
-            elif self.pasquill in ('C', 'D'):
-                return result if result < 400 else 400
-            else:
-                return result if result < 220 else 220
-
-        a_1, a_2, b_1, b_2, c_3 = self.stability_coefficients()
-        c_1, c_2, d_1, d_2 = self.roughness_coefficients()
+            return result if result < self.sigma_z_max else self.sigma_z_max
+
+        a_1, a_2, b_1, b_2, c_3 = self.stability
+        c_1, c_2, d_1, d_2 = self.roughness
         sigma_x = (c_3 * x_dist) / math.sqrt(1 + 0.000 * x_dist)
 
         sigma_y = sigma_x
@@ -162,6 +198,28 @@ class Source:
 
         return (sigma_x, sigma_y, sigma_z)
 
+    def dispersion_param_vector(self, x_dist: np.ndarray) -> tuple:
+        '''
+        Функция параметров дисперсии для массива расстояний
+        :param x_dist - массив дистанций, м
+        :return: sigma: tuple: кортеж массивов (sigma_x, sigma_y, sigma_z)
+        '''
+        a_1, a_2, b_1, b_2, c_3 = self.stability
+        c_1, c_2, d_1, d_2 = self.roughness
+        x_dist = np.asarray(x_dist, dtype=float)
+
+        sigma_x = (c_3 * x_dist) / np.sqrt(1 + 0.000 * x_dist)
+        sigma_y = sigma_x
+
+        g_x = (a_1 * np.power(x_dist, b_1)) / (1 + a_2 * np.power(x_dist, b_2))
+        if self.is_urban_area == 0:
+            f_z = np.log((c_1 * np.power(x_dist, d_1)) * (1 + c_2 * np.power(x_dist, d_2)))
+        else:
+            f_z = np.log((c_1 * np.power(x_dist, d_1)) / (1 + c_2 * np.power(x_dist, d_2)))
+        sigma_z = np.minimum(g_x * f_z, self.sigma_z_max)
+
+        return (sigma_x, sigma_y, sigma_z)
+
     def concentration(self, x_dist: int) -> float:
         '''
         Функция зависимости концентрации от расстояния
@@ -192,21 +250,248 @@ class Source:
         dose = ((2 * math.pow(2 * math.pi, 2)) / self.wind_speed) * concentration
         return dose
 
-    def result(self):
-        dist = []
-        conc = []
-        dose = []
-
-        for radius in range(1, 10000):
-            c = self.concentration(x_dist=radius)
-            d = self.toxic_dose(x_dist=radius)
-            dist.append(radius)
-            conc.append(c)
-            dose.append(d)
-            if radius < 100: continue
-            if d < 0.1: break
-
-        return (dist, conc, dose)
+    def concentration_vector(self, x_dist: np.ndarray) -> np.ndarray:
+        '''
+        Функция зависимости концентрации от расстояния для массива расстояний
+        :param x_dist - массив дистанций, м
+        :return: (concentration): np.ndarray: - концентрация, кг/м3
+        '''
+        sigma_x, sigma_y, sigma_z = self.dispersion_param_vector(x_dist)
+
+        g_n = np.exp(-math.pow(self.ejection_height, 2) / (2 * sigma_z * sigma_z)) * 10
+        volume = 2.67 * math.pi * math.pow(self.radius_first_cloud, 3) + math.pow(2 * math.pi, 3 / 2) * sigma_x * sigma_y * sigma_z
+
+        return (self.gas_weight + self.closing_time * self.gas_flow) / volume * g_n
+
+    def toxic_dose_vector(self, x_dist: np.ndarray) -> tuple:
+        '''
+        Концентрация и токсодоза для массива расстояний (концентрация считается один раз)
+        :param x_dist - массив дистанций, м
+        :return: (concentration, dose): np.ndarray: - концентрация, кг/м3 и токсодоза, мг*мин/л
+        '''
+        concentration = self.concentration_vector(x_dist)
+        dose = ((2 * math.pow(2 * math.pi, 2)) / self.wind_speed) * concentration
+        return (concentration, dose)
+
+    def ground_concentration(self, x_dist: np.ndarray, y_dist: np.ndarray) -> np.ndarray:
+        '''
+        Приземная концентрация в точках (x, y): концентрация на оси облака, умноженная
+        на поперечное гауссово распределение exp(-y^2 / (2 * sigma_y^2))
+        :param x_dist - массив расстояний по ветру, м (x <= 0 - концентрация 0)
+        :param y_dist - массив расстояний поперек ветра, м (согласован с x_dist по размеру)
+        :return: (concentration): np.ndarray: - концентрация, кг/м3
+        '''
+        x_dist = np.asarray(x_dist, dtype=float)
+        y_dist = np.asarray(y_dist, dtype=float)
+        downwind = x_dist > 0
+        x_safe = np.where(downwind, x_dist, 1)
+        _, sigma_y, _ = self.dispersion_param_vector(x_safe)
+        conc = self.concentration_vector(x_safe) * np.exp(-y_dist * y_dist / (2 * sigma_y * sigma_y))
+        return np.where(downwind, conc, 0)
+
+    def ground_field(self, x_dist: np.ndarray, y_dist: np.ndarray, path: str = None) -> np.ndarray:
+        '''
+        Поле приземной концентрации на прямоугольной сетке
+        :param x_dist - узлы сетки по ветру, м (nx)
+        :param y_dist - узлы сетки поперек ветра, м (ny)
+        :param path - путь к файлу .npy для записи поля (None - массив в памяти)
+        :return: np.ndarray float32 (ny, nx): концентрация, кг/м3
+        '''
+        x_dist = np.asarray(x_dist, dtype=float)
+        y_dist = np.asarray(y_dist, dtype=float)
+        field = field_array((y_dist.size, x_dist.size), path)
+
+        # ось облака и sigma_y зависят только от x - считаются один раз
+        downwind = x_dist > 0
+        x_safe = np.where(downwind, x_dist, 1)
+        _, sigma_y, _ = self.dispersion_param_vector(x_safe)
+        centre = np.where(downwind, self.concentration_vector(x_safe), 0)
+        inv_two_sigma2 = 1 / (2 * sigma_y * sigma_y)
+
+        for start in range(0, y_dist.size, FIELD_CHUNK):
+            y_chunk = y_dist[start:start + FIELD_CHUNK, None]
+            field[start:start + FIELD_CHUNK] = centre * np.exp(-(y_chunk * y_chunk) * inv_two_sigma2)
+
+        if isinstance(field, np.memmap):
+            field.flush()
+        return field
+
+    def ground_field_polar(self, radius: np.ndarray, angle: np.ndarray, path: str = None) -> np.ndarray:
+        '''
+        Поле приземной концентрации на полярной сетке с центром в источнике
+        :param radius - узлы сетки по расстоянию от источника, м (nr)
+        :param angle - узлы сетки по углу от направления ветра, град (na)
+        :param path - путь к файлу .npy для записи поля (None - массив в памяти)
+        :return: np.ndarray float32 (na, nr): концентрация, кг/м3
+        '''
+        radius = np.asarray(radius, dtype=float)
+        angle = np.radians(np.asarray(angle, dtype=float))
+        field = field_array((angle.size, radius.size), path)
+
+        for start in range(0, angle.size, FIELD_CHUNK):
+            angle_chunk = angle[start:start + FIELD_CHUNK, None]
+            field[start:start + FIELD_CHUNK] = self.ground_concentration(radius * np.cos(angle_chunk),
+                                                                         radius * np.sin(angle_chunk))
+
+        if isinstance(field, np.memmap):
+            field.flush()
+        return field
+
+    def toxic_effect(self, concentration: np.ndarray, substance: str, exposure_time: float) -> tuple:
+        '''
+        Пробит-функция и вероятность поражения для массива концентраций
+        :param concentration - массив концентраций, кг/м3
+        :param substance - вещество (см. calc_probit.TOXIC_SUBSTANCES)
+        :param exposure_time - время экспозиции, мин
+        :return: (probit, probability): кортеж массивов np.ndarray
+        '''
+        if exposure_time is None:
+            raise ValueError('Для расчета вероятности поражения нужно время экспозиции')
+        return Probit().toxic_vector(substance, exposure_time, np.asarray(concentration) * KGM3_TO_MGLITER)
+
+    def profile(self, points: int = 200, max_distance: float = RESULT_DISTANCE,
+                dose_limit: float = DOSE_LIMIT, substance: str = None, exposure_time: float = None) -> tuple:
+        '''
+        Профиль концентрации и токсодозы на логарифмической сетке расстояний от 1 м до max_distance.
+        Сетка обрезается на первой точке за максимумом токсодозы, где токсодоза < dose_limit (включительно)
+        :param points - количество точек сетки
+        :param max_distance - предельное расстояние, м
+        :param dose_limit - токсодоза, до которой ведется расчет, мг*мин/л
+        :param substance - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time - время экспозиции, мин (обязательно, если задано вещество)
+        :return: (dist, conc, dose): кортеж массивов np.ndarray,
+        если задано вещество - (dist, conc, dose, probit, probability)
+        '''
+        dist = np.geomspace(1, max_distance, points)
+        conc, dose = self.toxic_dose_vector(dist)
+        res = self._cut_off(dist, conc, dose, int(dose.argmax()), dose_limit)
+        if substance is None:
+            return res
+        return res + self.toxic_effect(res[1], substance, exposure_time)
+
+    def _cut_off(self, dist, conc, dose, start: int, dose_limit: float) -> tuple:
+        '''
+        Обрезка профиля на первой точке с индексом >= start, где токсодоза < dose_limit (включительно)
+        '''
+        below = np.flatnonzero(dose[start:] < dose_limit)
+        stop = start + below[0] + 1 if below.size else dist.size
+        return (dist[:stop], conc[:stop], dose[:stop])
+
+    def result(self, substance: str = None, exposure_time: float = None):
+        '''
+        :param substance - вещество для расчета вероятности поражения (None - без расчета)
+        :param exposure_time - время экспозиции, мин (обязательно, если задано вещество)
+        :return: (dist, conc, dose) - списки расстояний м, концентраций кг/м3 и токсодоз мг*мин/л,
+        если задано вещество - (dist, conc, dose, probit, probability)
+        '''
+        # сетка 1 м до RESULT_DISTANCE считается векторно, расчет до 100 м ведется всегда
+        dist = np.arange(1, RESULT_DISTANCE)
+        conc, dose = self.toxic_dose_vector(dist)
+        res = self._cut_off(dist, conc, dose, 99, DOSE_LIMIT)
+        if substance is not None:
+            res = res + self.toxic_effect(res[1], substance, exposure_time)
+
+        return tuple(item.tolist() for item in res)
+
+
+class Weather_sweep:
+    def __init__(self, source: Source, cases, radius: np.ndarray, angle_step: float = 1):
+        """
+        Расчет выброса по метеорологической матрице: поля токсодозы и вероятности поражения,
+        взвешенные по частоте метеоусловий, на полярной сетке с центром в источнике.
+
+        Концентрация в модели зависит от скорости ветра только через токсодозу, а от класса
+        стабильности - через коэффициенты (A-B, C-D, E-F), поэтому поле концентрации считается
+        один раз на группу классов, а направления ветра - сдвиг поля по углу.
+
+        :param source - источник (параметры выброса, кроме метеоусловий)
+        :param cases - метеоусловия: кортежи (класс стабильности, скорость ветра м/с,
+                       направление распространения облака град (от оси x против часовой стрелки), частота)
+        :param radius - узлы сетки по расстоянию от источника, м
+        :param angle_step - шаг сетки по углу, град (направления ветра округляются до узла сетки)
+        """
+        self.source = source
+        self.cases = [tuple(case) for case in cases]
+        self.radius = np.asarray(radius, dtype=float)
+        self.angle_step = angle_step
+        self.angle = np.arange(0, 360, angle_step)
+
+        for pasquill, wind_speed, direction, frequency in self.cases:
+            if pasquill not in PASQUILL_CLASSES:
+                raise ValueError(f'Неизвестный класс стабильности атмосферы: {pasquill}')
+            if wind_speed <= 0 or frequency < 0:
+                raise ValueError('Скорость ветра должна быть больше 0, частота - не меньше 0')
+
+    def groups(self) -> dict:
+        '''
+        Группировка метеоусловий по одинаковым коэффициентам дисперсии
+        :return: dict: {класс стабильности (первый в группе): [метеоусловия]}
+        '''
+        res = {}
+        keys = {}
+        for case in self.cases:
+            source = self.source.with_stability(case[0])
+            key = (source.stability, source.sigma_z_max)
+            res.setdefault(keys.setdefault(key, case[0]), []).append(case)
+        return res
+
+    def _shift(self, direction: float) -> int:
+        'Сдвиг поля по углу (в узлах сетки) для направления ветра'
+        return int(round(direction / self.angle_step)) % self.angle.size
+
+    def concentration_field(self, pasquill: str) -> np.ndarray:
+        '''
+        Поле приземной концентрации при ветре вдоль оси x (угол 0)
+        :param pasquill - класс стабильности атмосферы
+        :return: np.ndarray float32 (угол, расстояние): концентрация, кг/м3
+        '''
+        return self.source.with_stability(pasquill).ground_field_polar(self.radius, self.angle)
+
+    def dose_field(self, path: str = None) -> np.ndarray:
+        '''
+        Поле токсодозы, взвешенное по частоте метеоусловий: sum(частота * токсодоза)
+        :param path - путь к файлу .npy для записи поля (None - массив в памяти)
+        :return: np.ndarray float32 (угол, расстояние): токсодоза, мг*мин/л
+        '''
+        field = field_array((self.angle.size, self.radius.size), path)
+        field[:] = 0
+        for pasquill, cases in self.groups().items():
+            concentration = self.concentration_field(pasquill)
+            # токсодоза пропорциональна концентрации / скорость ветра - веса суммируются по направлениям
+            weights = {}
+            for _, wind_speed, direction, frequency in cases:
+                shift = self._shift(direction)
+                weights[shift] = weights.get(shift, 0) + frequency * (2 * math.pow(2 * math.pi, 2)) / wind_speed
+            for shift, weight in weights.items():
+                field += np.roll(concentration, shift, axis=0) * np.float32(weight)
+        if isinstance(field, np.memmap):
+            field.flush()
+        return field
+
+    def probability_field(self, substance: str, exposure_time: float, path: str = None) -> np.ndarray:
+        '''
+        Поле вероятности поражения, взвешенное по частоте метеоусловий: sum(частота * вероятность)
+        :param substance - вещество (см. calc_probit.TOXIC_SUBSTANCES)
+        :param exposure_time - время экспозиции, мин
+        :param path - путь к файлу .npy для записи поля (None - массив в памяти)
+        :return: np.ndarray float32 (угол, расстояние): вероятность поражения
+        '''
+        probit_cls = Probit()
+        field = field_array((self.angle.size, self.radius.size), path)
+        field[:] = 0
+        for pasquill, cases in self.groups().items():
+            concentration = self.concentration_field(pasquill) * KGM3_TO_MGLITER
+            _, probability = probit_cls.toxic_vector(substance, exposure_time, concentration)
+            probability = probability.astype(np.float32)
+            weights = {}
+            for _, _, direction, frequency in cases:
+                shift = self._shift(direction)
+                weights[shift] = weights.get(shift, 0) + frequency
+            for shift, weight in weights.items():
+                field += np.roll(probability, shift, axis=0) * np.float32(weight)
+        if isinstance(field, np.memmap):
+            field.flush()
+        return field
 
 
 #
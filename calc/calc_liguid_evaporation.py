@@ -5,6 +5,7 @@
 # (C) 2022 Kuznetsov Konstantin, Kazan , Russian Federation
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
+import numpy as np
 
 
 class Liquid_evaporation:
@@ -42,13 +43,36 @@ class Liquid_evaporation:
         """
 
         time_arr = [t for t in range(1, 3601)]
-        evaporatiom_arr = [self.evaporation_in_moment(t, steam_pressure, molar_mass, strait_area)[0] for t in
-                           range(1, 3601)]
+        evaporatiom_arr = self.evaporation_curve(time_arr, steam_pressure, molar_mass, strait_area).tolist()
 
         result = (time_arr, evaporatiom_arr)
 
         return result
 
+    def evaporation_curve(self, time, steam_pressure, molar_mass, strait_area) -> np.ndarray:
+
+        """
+        Масса испарившейся жидкости на произвольной сетке времени (линейная зависимость от времени)
+
+        :@param time: массив времени, с
+        :@param steam_pressure: давление пара, кПа (число или массив)
+        :@param molar_mass: молярная масса, кг/кмоль (число или массив)
+        :@param strait_area: площадь пролива, м2 (число или массив)
+
+        :@return: mass: масса испарившейся жидкости, кг; форма - общая форма параметров
+                  (steam_pressure, molar_mass, strait_area) + форма time
+        """
+        steam_pressure, molar_mass, strait_area = np.broadcast_arrays(
+            np.asarray(steam_pressure, dtype=float), np.asarray(molar_mass, dtype=float),
+            np.asarray(strait_area, dtype=float))
+        # Проверки
+        if np.any(steam_pressure == 0) or np.any(molar_mass == 0) or np.any(strait_area == 0):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+        time = np.asarray(time, dtype=float)
+        intensity = pow(10, -6) * steam_pressure * np.sqrt(molar_mass)  # кг/(с*м2)
+        rate = (intensity * strait_area)[(...,) + (None,) * time.ndim]  # кг/с
+        return rate * time
+
 
 if __name__ == '__main__':
     ev_class = Liquid_evaporation()
@@ -7,6 +7,7 @@
 # -----------------------------------------------------------
 
 import math
+import numpy as np
 
 GRAVITY = 9.81  # ускорение свободного падения м/с2
 DISCHARGE = 0.6  # коэф.истечения, допускается брать 0.6 (p.31 РБ оценка риска на нефтедобыче)
@@ -102,8 +103,112 @@ class Outflow_in_one_section_pipe:
         return (mass_liquid, time, flow_rate)
 
 
+class Outflow_in_pipeline:
+    def __init__(self, chainage, elevation, common_pressure: float, diametr: float, density: float,
+                 hole: float, time_shutdown: float, time_closing: float, valves=None):
+        '''
+        Класс предназначен для оценки количества опасного вещества, истекающего
+        из многосекционного трубопровода (профиль по данным изысканий), для всех
+        возможных мест повреждения сразу.
+        Для места повреждения i: напорный режим до отключения давления, безнапорный режим
+        с подпором до закрытия арматуры и самотечное опорожнение участка между
+        ближайшими перевальными точками слева и справа (в пределах секции между задвижками).
+        :param chainage: пикетаж узлов профиля (возрастающий), м
+        :param elevation: высотные отметки узлов профиля, м
+        :param common_pressure: начальное давление, МПа
+        :param diametr: диаметр, мм
+        :param density: плотность, кг/м3
+        :param hole: отверстие истечения, мм
+        :param time_shutdown: время отключения давления, с
+        :param time_closing: время закрытия арматуры, с
+        :param valves: пикетаж задвижек, м (None - задвижки только на концах трубопровода)
+        '''
+        self.chainage = np.asarray(chainage, dtype=float)
+        self.elevation = np.asarray(elevation, dtype=float)
+        if self.chainage.shape != self.elevation.shape or self.chainage.size < 2:
+            raise ValueError('Пикетаж и высотные отметки должны быть массивами одной длины (не менее 2 узлов)')
+        if np.any(np.diff(self.chainage) <= 0):
+            raise ValueError('Пикетаж должен возрастать')
+        self.common_pressure = common_pressure
+        self.diametr = diametr
+        self.density = density
+        self.hole = hole
+        self.time_shutdown = time_shutdown
+        self.time_closing = time_closing
+        self.valves = [] if valves is None else sorted(valves)
+
+        # расчетные формулы расхода одного участка (не зависят от места повреждения)
+        self.section = Outflow_in_one_section_pipe(common_pressure, 0, 0, diametr, density, 0, hole,
+                                                   time_shutdown, time_closing)
+
+    def pipe_length(self) -> np.ndarray:
+        'Длина трубопровода от начала до каждого узла с учетом профиля (префиксная сумма), м'
+        segment = np.hypot(np.diff(self.chainage), np.diff(self.elevation))
+        return np.concatenate(([0], np.cumsum(segment)))
+
+    def section_bounds(self) -> list:
+        'Границы секций между задвижками: [(первый узел, последний узел)]'
+        index = np.searchsorted(self.chainage, self.valves)
+        index = sorted({int(i) for i in index if 0 < i < self.chainage.size - 1})
+        starts = [0] + index
+        ends = index + [self.chainage.size - 1]
+        return list(zip(starts, ends))
+
+    def pass_points(self) -> tuple:
+        '''
+        Ближайшие перевальные точки слева и справа от каждого узла в пределах его секции:
+        концы участков непрерывного подъема профиля от узла (локальные максимумы отметок),
+        за один проход накопленным максимумом индексов. Между перевальными точками
+        профиль монотонно понижается к узлу, поэтому опорожняется весь этот участок
+        :return: (left, right): массивы индексов узлов
+        '''
+        left = np.empty(self.chainage.size, dtype=int)
+        right = np.empty(self.chainage.size, dtype=int)
+        for start, end in self.section_bounds():
+            z = self.elevation[start:end + 1]
+            left[start:end + 1] = start + _uphill_end(z)
+            right[start:end + 1] = end - _uphill_end(z[::-1])[::-1]
+        return (left, right)
+
+    def drain_volume(self) -> np.ndarray:
+        'Объем самотечного опорожнения для повреждения в каждом узле, м3'
+        left, right = self.pass_points()
+        length = self.pipe_length()
+        return (math.pi / 4) * math.pow(self.section.diametr, 2) * (length[right] - length[left])
+
+    def result(self) -> tuple:
+        '''
+        Масса истечения для повреждения в каждом узле профиля
+        :return: (chainage, mass_pressure, mass_non_pressure, mass_drain, mass_leaking):
+        пикетаж, м; масса в напорном режиме, с подпором до закрытия арматуры,
+        при самотечном опорожнении и суммарная, кг
+        '''
+        left, right = self.pass_points()
+        head = np.maximum(self.elevation[left], self.elevation[right]) - self.elevation
+        Ah = (math.pi / 4) * math.pow(self.section.hole, 2)
+        p1 = self.density * GRAVITY * head
+        flow_rate = DISCHARGE * Ah * self.density * np.sqrt(2 * np.maximum(p1 - PRESSURE_ATM, 0) / self.density)
+
+        mass_pressure = np.full(self.chainage.size, self.section.pressure_flow_rate() * self.time_shutdown)
+        mass_non_pressure = flow_rate * self.time_closing
+        mass_drain = self.drain_volume() * self.density
+        return (self.chainage, mass_pressure, mass_non_pressure, mass_drain,
+                mass_pressure + mass_non_pressure + mass_drain)
+
+
+def _uphill_end(z: np.ndarray) -> np.ndarray:
+    '''
+    Для каждого узла i - индекс конца участка подъема профиля влево от i:
+    наименьший j <= i, для которого z[j] >= z[j + 1] >= ... >= z[i]
+    '''
+    # узел начинает новый участок, если он выше соседа слева (или это первый узел)
+    start = np.concatenate(([True], z[1:] > z[:-1]))
+    return np.maximum.accumulate(np.where(start, np.arange(z.size), 0))
+
+
 if __name__ == '__main__':
     cls = Outflow_in_one_section_pipe(common_pressure=2, z1=250, z2=120, diametr=100, density=900,
                                       lenght=1000,
                                       hole=90, time_shutdown=3, time_closing=3)
     print(cls.result())
+
@@ -10,6 +10,8 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 import math
+import numpy as np
+from scipy.integrate import solve_ivp
 
 DISCHARGE = 0.62  # коэф.истечения, допускается брать 0.62 (p.53)
 TEMP_TO_KELVIN = 273
@@ -18,11 +20,13 @@ MM_TO_M = math.pow(10, -3)  # мм в м
 PRESSURE_ATM = 101325  # атмосферное давление, Па
 GRAVITY = 9.81  # ускорение свободного падения м/с2
 PERSENT_BREAK = 0.99  # процент при котором остановить расчет
+TIME_STEP = 1000  # временной шаг истечения по умолчанию, с
+TIME_MAX = 10 ** 8  # ограничение времени расчета с адаптивным шагом, с
 
 
 class Outflow:
     def __init__(self, volume: float, height: float, pressure: float,
-                 fill_factor: float, hole_diametr: float, density: float):
+                 fill_factor: float, hole_diametr: float, density: float, time_step: float = TIME_STEP):
         '''
         Класс предназначен для расчета истечения газа
         :param volume: - объем, м3
@@ -39,7 +43,7 @@ class Outflow:
         self.fill_factor = fill_factor
         self.hole_diametr = hole_diametr * MM_TO_M
         self.density = density
-        self.time_step = 1000
+        self.time_step = time_step
 
     def result(self):
         mass_liquid = []  # масса жидкости в емкости, кг
@@ -52,6 +56,7 @@ class Outflow:
         mass_leaking = []  # масса жидкости в проливе, кг
 
         time_init = 0
+        leaked = 0  # накопленная сумма delta_mass
 
         while True:
             Ah = (math.pi / 4) * math.pow(self.hole_diametr, 2)
@@ -63,6 +68,7 @@ class Outflow:
                 pressure.append(round(self.density * GRAVITY * height[-1] + self.pressure, 2))
                 flow_rate.append(round(DISCHARGE * Ah * math.sqrt(2 * (pressure[-1] - PRESSURE_ATM) * self.density), 2))
                 delta_mass.append(round(flow_rate[-1] * self.time_step, 2))
+                leaked += delta_mass[-1]
                 mass_leaking.append(0)
 
                 time_init += self.time_step
@@ -75,7 +81,8 @@ class Outflow:
                 pressure.append(round(self.density * GRAVITY * height[-1] + self.pressure, 2))
                 flow_rate.append(round(DISCHARGE * Ah * math.sqrt(2 * (pressure[-1] - PRESSURE_ATM) * self.density), 2))
                 delta_mass.append(round(flow_rate[-1] * self.time_step, 2))
-                mass_leaking.append(sum(delta_mass))
+                leaked += delta_mass[-1]
+                mass_leaking.append(leaked)
 
                 time_init += self.time_step
 
@@ -93,6 +100,127 @@ class Outflow:
                 delta_mass,
                 mass_leaking)
 
+    def tank_area(self) -> float:
+        'Площадь сечения резервуара, м2'
+        return self.volume / self.height
+
+    def drain_coefficient(self) -> float:
+        '''
+        Коэффициент c в уравнении истечения dh/dt = -c * sqrt(a + h), 1/с*м^0.5
+        (a - избыточное давление над жидкостью в метрах столба жидкости)
+        '''
+        Ah = (math.pi / 4) * math.pow(self.hole_diametr, 2)
+        return DISCHARGE * Ah * math.sqrt(2 * GRAVITY) / self.tank_area()
+
+    def height_analytic(self, time) -> np.ndarray:
+        '''
+        Высота взлива при постоянном давлении над жидкостью (решение в замкнутой форме):
+        sqrt(a + h) = sqrt(a + h0) - c * t / 2
+        :param time: - массив времени, с
+        :return: массив высоты взлива, м (после опорожнения - 0; если разрежение над жидкостью
+                 не меньше столба жидкости - истечения нет, высота не меняется)
+        '''
+        head = (self.pressure - PRESSURE_ATM) / (self.density * GRAVITY)
+        height_init = self.fill_factor * self.height
+        if head + height_init <= 0:
+            return np.full(np.shape(time), float(height_init))
+        root = math.sqrt(max(head + height_init, 0)) - self.drain_coefficient() * np.asarray(time) / 2
+        return np.maximum(np.maximum(root, 0) ** 2 - head, 0)
+
+    def result_continuous(self, time_grid=None, gas_expansion: bool = False):
+        '''
+        Истечение без шага по времени (см. result_arrays) в виде кортежа списков, как в result:
+        (mass_liquid, time, fill_tank, height, pressure, flow_rate, delta_mass, mass_leaking)
+        '''
+        return tuple(item.tolist() for item in self.result_arrays(time_grid, gas_expansion))
+
+    def result_arrays(self, time_grid=None, gas_expansion: bool = False) -> tuple:
+        '''
+        Истечение без шага по времени: при постоянном давлении над жидкостью - решение
+        в замкнутой форме, при расширении газовой подушки (изотермическом, давление падает
+        по мере опорожнения) - интегрирование методом Рунге-Кутты 5(4) с автоматическим шагом
+        (scipy.integrate.solve_ivp).
+        Расчет ведется до истечения PERSENT_BREAK начальной массы (или до прекращения истечения)
+
+        :param time_grid: - сетка времени для вывода, с (None - с шагом time_step);
+                            узлы после окончания расчета отбрасываются, момент окончания добавляется
+        :param gas_expansion: - учитывать падение давления газовой подушки
+        :return: кортеж массивов в порядке result:
+        (mass_liquid, time, fill_tank, height, pressure, flow_rate, delta_mass, mass_leaking),
+        delta_mass - масса истечения с предыдущего момента вывода, mass_leaking - с начала истечения
+        '''
+        area = self.tank_area()
+        Ah = (math.pi / 4) * math.pow(self.hole_diametr, 2)
+        height_init = self.fill_factor * self.height
+        height_stop = (1 - PERSENT_BREAK) * height_init
+        gas_volume = self.volume - area * height_init
+        head = (self.pressure - PRESSURE_ATM) / (self.density * GRAVITY)
+
+        if head + height_init <= 0:
+            # разрежение над жидкостью не меньше столба жидкости - истечения нет
+            height = np.array([height_init], dtype=float)
+            zero = np.zeros(1)
+            return (self.density * area * height, zero, height / self.height, height,
+                    self.density * GRAVITY * height + self.pressure, zero, zero, zero)
+
+        def gas_pressure(height):
+            if not gas_expansion:
+                return self.pressure
+            return self.pressure * gas_volume / (self.volume - area * height)
+
+        if gas_expansion:
+            if gas_volume <= 0:
+                raise ValueError('Для расширения газовой подушки степень заполнения должна быть меньше 1')
+
+            def drain(t, state):
+                head = gas_pressure(state[0]) - PRESSURE_ATM + self.density * GRAVITY * state[0]
+                return (-DISCHARGE * Ah * math.sqrt(2 * max(head, 0) * self.density) / (self.density * area),)
+
+            def break_event(t, state):
+                return state[0] - height_stop
+
+            def stop_event(t, state):
+                return gas_pressure(state[0]) - PRESSURE_ATM + self.density * GRAVITY * state[0]
+
+            events = (break_event, stop_event)
+            for event in events:
+                event.terminal = True
+                event.direction = -1
+
+            if any(event(0, (height_init,)) <= 0 for event in events):
+                solution = None
+                time_end = 0
+            else:
+                solution = solve_ivp(drain, (0, TIME_MAX), (height_init,), method='RK45', events=events,
+                                     dense_output=True, rtol=1e-6, atol=1e-9)
+                time_end = solution.t[-1]
+        else:
+            # при давлении ниже атмосферного истечение прекращается при h = -a
+            height_stop = max(height_stop, -head)
+            time_end = 2 * (math.sqrt(max(head + height_init, 0)) -
+                            math.sqrt(max(head + height_stop, 0))) / self.drain_coefficient()
+            time_end = max(time_end, 0)
+
+        if time_grid is None:
+            time_grid = np.arange(0, time_end, self.time_step)
+        time = np.asarray(time_grid, dtype=float)
+        time = np.append(time[time < time_end], time_end)
+
+        if gas_expansion:
+            height = solution.sol(time)[0] if solution is not None else np.full(time.size, float(height_init))
+            pressure_gas = self.pressure * gas_volume / (self.volume - area * height)
+        else:
+            height = self.height_analytic(time)
+            pressure_gas = np.full(time.size, float(self.pressure))
+
+        pressure = self.density * GRAVITY * height + pressure_gas
+        flow_rate = DISCHARGE * Ah * np.sqrt(2 * np.maximum(pressure - PRESSURE_ATM, 0) * self.density)
+        mass_liquid = self.density * area * height
+        mass_leaking = mass_liquid[0] - mass_liquid
+        delta_mass = np.diff(mass_leaking, prepend=0)
+
+        return (mass_liquid, time, height / self.height, height, pressure, flow_rate, delta_mass, mass_leaking)
+
 
 if __name__ == '__main__':
     cls = Outflow(6000, 15, 0, 0.75, 100, 773)
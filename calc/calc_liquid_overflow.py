@@ -1,9 +1,9 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 
 GRAVITY = 9.81  # м/с2
 TIME_STEP = 0.01
+TIME_MAX = 1  # горизонт расчета разрушения резервуара, с
 
 
 class LIGUID_OVERFLOW:
@@ -11,18 +11,21 @@ class LIGUID_OVERFLOW:
     Класс предназначени для расчета перелива ЛВЖ
     """
 
-    def __init__(self, height_liguid_init: float, volume_init: float, dist: float, flanging_height: float):
+    def __init__(self, height_liguid_init: float, volume_init: float, dist: float, flanging_height: float,
+                 time_max: float = TIME_MAX):
         '''
 
         :@param height_liguid_init: начальная высота столба жидкости, м
         :@param volume_init: объем жидкости, м3
         :@param dist: расстояние от края резервуара до обвалования, м
         :@param flanging_height: высота отбортовки, м
+        :@param time_max: горизонт расчета, с
         '''
         self.height_liguid_init = height_liguid_init
         self.volume_init = volume_init
         self.dist = dist
         self.flanging_height = flanging_height
+        self.time_max = time_max
 
     def overflow_in_moment(self):
         t = []  # время, с
@@ -32,7 +35,7 @@ class LIGUID_OVERFLOW:
         s = []  # площадь цилиндра, м2
         Q = []  # доля перелившейся жидкости, %
 
-        for time in np.arange(0, 1, TIME_STEP):
+        for time in np.arange(0, self.time_max, TIME_STEP):
             if time == 0:
                 t.append(0)
                 s.append(self.volume_init / self.height_liguid_init)
@@ -51,12 +54,79 @@ class LIGUID_OVERFLOW:
                 Q.append(0)
             else:
                 k = self.flanging_height / hn[-1]
-                Q.append(round(-30.594 * pow(k, 4) + 75.078 * pow(k, 3) - 31.133 * pow(k, 2) - 67.152 * pow(k, 1) + 60.205,2))
+                Q.append(round(float(overflow_percent(k)), 2))
                 return (t, s, hn, un, x, Q)
-        raise ValueError
+        raise ValueError(f'Фронт волны не достиг обвалования за {self.time_max} с')
+
+
+def overflow_percent(k):
+    '''
+    Доля перелившейся жидкости по отношению высоты отбортовки к высоте столба жидкости
+    :@param k: отношение высоты отбортовки к высоте столба жидкости в момент подхода волны, -
+
+    :@return: доля перелившейся жидкости, % (аппроксимация ограничена диапазоном 0 - 100)
+    '''
+    # аппроксимация вне области применимости дает отрицательную долю - перелива нет
+    return np.clip(-30.594 * k ** 4 + 75.078 * k ** 3 - 31.133 * k ** 2 - 67.152 * k + 60.205, 0, 100)
+
+
+def sweep(height_liguid_init, volume_init, dist, flanging_height,
+          time_step: float = TIME_STEP, time_max: float = TIME_MAX) -> tuple:
+    '''
+    Перелив для всех сочетаний параметров резервуара и обвалования (векторно):
+    столбы жидкости всех резервуаров рассчитываются одновременно с шагом time_step,
+    момент подхода волны к обвалованию уточняется линейной интерполяцией внутри шага
+
+    :@param height_liguid_init: массив начальных высот столба жидкости, м
+    :@param volume_init: массив объемов жидкости, м3
+    :@param dist: массив расстояний от края резервуара до обвалования, м
+    :@param flanging_height: массив высот отбортовки, м
+    :@param time_step: шаг по времени, с
+    :@param time_max: горизонт расчета, с
+
+    :@return: (time, height, overflow): время подхода волны, с; высота столба жидкости
+              в этот момент, м (высота, объем, расстояние); доля перелившейся жидкости, %
+              (высота, объем, расстояние, отбортовка); если волна не дошла за time_max - nan
+    '''
+    h0 = np.atleast_1d(np.asarray(height_liguid_init, dtype=float))[:, None, None]
+    volume = np.atleast_1d(np.asarray(volume_init, dtype=float))[None, :, None]
+    dist = np.atleast_1d(np.asarray(dist, dtype=float))[None, None, :]
+    flanging = np.atleast_1d(np.asarray(flanging_height, dtype=float))
+
+    # волна у обвалования, когда радиус цилиндра sqrt(V / (pi * h)) достигает x0 + dist
+    x0 = np.sqrt(volume / (math.pi * h0))
+    h_arrival = volume / (math.pi * (x0 + dist) ** 2)
+
+    shape = np.broadcast_shapes(h0.shape, volume.shape, dist.shape)
+    h = np.broadcast_to(h0, shape).copy()
+    h_arrival = np.broadcast_to(h_arrival, shape)
+    time = np.where(np.broadcast_to(dist <= 0, shape), 0.0, np.nan)
+    active = np.isnan(time)
+
+    for step in range(int(math.ceil(time_max / time_step))):
+        if not active.any():
+            break
+        h_prev = h[active]
+        h_next = h_prev - time_step * np.sqrt(2 * GRAVITY * h_prev)
+        target = h_arrival[active]
+        arrived = h_next <= target
+        # линейная интерполяция момента подхода внутри шага
+        fraction = (h_prev[arrived] - target[arrived]) / (h_prev[arrived] - h_next[arrived])
+        t_arrived = (step + fraction) * time_step
+
+        index = tuple(i[arrived] for i in np.nonzero(active))
+        time[index] = np.where(t_arrived <= time_max, t_arrived, np.nan)
+        h[active] = np.maximum(h_next, 0)
+        active[index] = False
+
+    height = np.where(np.isnan(time), np.nan, h_arrival)
+    overflow = overflow_percent(flanging / height[..., None])
+    return (time, height, overflow)
 
 
 if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+
     ov_class = LIGUID_OVERFLOW(height_liguid_init=12, volume_init=5000, dist=8, flanging_height=1.5)
     for i in ov_class.overflow_in_moment():
         print(i)
@@ -8,22 +8,185 @@
 # -----------------------------------------------------------
 
 import math
+import numpy as np
+
+from scipy.special import ndtr
+
+# коэффициенты пробит-функции токсического поражения (a, b, n), Pr = a + b * ln(C^n * t)
+# (см. Основы моделирования чрезвычайных ситуаций: учеб. пособие
+# / В. Г. Шаптала, В. Ю. Радоуцкий, В. В. Шаптала; под общ. ред.
+# В. Г. Шапталы. – Белгород: Изд-во БГТУ, 2010. – 166 с)
+TOXIC_SUBSTANCES = {
+    'Аммиак': (-35.9, 1.85, 2),
+    'Соляная кислота': (-16.85, 2, 1),
+    'Сероводород': (-31.42, 3.008, 1.43),
+    'Формальдегид': (-12.24, 1.3, 2),
+    'Хлор': (-8.29, 0.92, 2),
+    'Окись этилена': (-6.21, 1, 1),
+}
+
+# коэффициенты полинома аппроксимации вероятности поражения (от старшей степени)
+PROBABILITY_POLYNOMIAL = (-0.00064545, 0.02327, -0.33495, 2.4406, -9.41, 18.31, -14.156)
+
+PROBIT_MIN = 2.67  # нижняя граница пробит-функции
+PROBIT_MAX = 8.09  # верхняя граница пробит-функции
+
+# способы вычисления вероятности поражения
+PROBABILITY_MODES = ('polynomial', 'exact', 'table')
+
+PROBABILITY_TABLE_SIZE = 4097  # количество узлов таблицы вероятности по умолчанию
+
+_probability_tables = {}  # таблицы вероятности, построенные по запросу (ключ - количество узлов)
+_probability_table_lists = {}  # те же таблицы в виде списков для скалярных вызовов
+
+
+def _horner(probit):
+    'Полином вероятности поражения по схеме Горнера (число или массив)'
+    q_vp = PROBABILITY_POLYNOMIAL[0]
+    for coefficient in PROBABILITY_POLYNOMIAL[1:]:
+        q_vp = q_vp * probit + coefficient
+    return q_vp
+
+
+def _probit_explosion(delta_P, impuls, log):
+    'Пробит-функция при взрыве без проверки (log - math.log или np.log)'
+    delta_P = delta_P * 1000  # кПа -> Па
+    V1 = ((17500 / delta_P) ** 8.4) + ((290 / impuls) ** 9.3)
+    return 5 - 0.26 * log(V1)
+
+
+def _probit_thermal(time, q_term, log):
+    'Пробит-функция при тепловом излучении без проверки (log - math.log или np.log)'
+    return -12.8 + 2.56 * log(time * (q_term ** (4 / 3)))
+
+
+def _strait_fire_time(dist):
+    'Время воздействия пожара пролива с учетом выхода из зоны, с'
+    t0 = 60  # время обнаружения пожара по методике, с
+    speed = 1  # средняя скорость, м/с
+    return t0 + (dist * 5 / speed)
+
+
+def _probit_toxic(substance: str, time, concentration, log):
+    'Пробит-функция токсического поражения без проверки (log - math.log или np.log)'
+    a, b, n = TOXIC_SUBSTANCES.get(substance, TOXIC_SUBSTANCES['Аммиак'])
+    return a + b * log((concentration ** n) * time)
+
+
+def probability_polynomial(probit: np.ndarray) -> np.ndarray:
+    """
+    Полиномиальная аппроксимация вероятности поражения без округления
+    (полином вычисляется по схеме Горнера)
+    :@param probit: массив значений пробит-функции
+
+    :@return: np.ndarray
+    """
+    q_vp = _horner(np.asarray(probit, dtype=float))
+    # проверка (вероятность гибели не может быть больше 0.99 и меньше 0
+    return np.clip(q_vp, 0, 0.99)
+
+
+def probability_table(table_size: int = PROBABILITY_TABLE_SIZE) -> tuple:
+    """
+    Таблица значений полинома вероятности поражения (без ограничения 0...0.99)
+    на равномерной сетке пробит-функции от 2.67 до 8.09 и наклоны на интервалах
+    (строится один раз для каждого размера)
+    :@param table_size: количество узлов таблицы
+
+    :@return: tuple: (table, slope): np.ndarray
+    :@raise: таблица должна содержать не менее двух узлов
+    """
+    if table_size < 2:
+        raise ValueError('Таблица должна содержать не менее двух узлов')
+    if table_size not in _probability_tables:
+        table = _horner(np.linspace(PROBIT_MIN, PROBIT_MAX, table_size))
+        slope = np.diff(table)
+        _probability_tables[table_size] = (table, slope)
+        _probability_table_lists[table_size] = (table.tolist(), slope.tolist())
+    return _probability_tables[table_size]
+
+
+def probability_interpolated(probit: np.ndarray, table_size: int = PROBABILITY_TABLE_SIZE) -> np.ndarray:
+    """
+    Вероятность поражения линейной интерполяцией по таблице без округления:
+    номер интервала находится арифметикой по равномерной сетке, ограничение 0...0.99
+    применяется после интерполяции. Значения вне интервала 2.67...8.09 считаются по полиному.
+    :@param probit: массив значений пробит-функции
+    :@param table_size: количество узлов таблицы
+
+    :@return: np.ndarray
+    """
+    probit = np.asarray(probit, dtype=float)
+    table, slope = probability_table(table_size)
+
+    # вычисления на месте: position -> доля интервала, q_vp -> вероятность
+    position = np.atleast_1d(probit - PROBIT_MIN)
+    position *= (table_size - 1) / (PROBIT_MAX - PROBIT_MIN)
+    np.clip(position, 0, table_size - 1, out=position)
+    index = position.astype(np.intp)
+    np.minimum(index, table_size - 2, out=index)
+    position -= index
+    q_vp = slope[index]
+    q_vp *= position
+    q_vp += table[index]
+    np.clip(q_vp, 0, 0.99, out=q_vp)
+    q_vp = q_vp.reshape(probit.shape)
+
+    outside = (probit < PROBIT_MIN) | (probit > PROBIT_MAX)
+    if outside.any():
+        q_vp = np.where(outside, probability_polynomial(np.where(outside, probit, PROBIT_MIN)), q_vp)
+
+    return q_vp
+
+
+def probability_table_error(table_size: int = PROBABILITY_TABLE_SIZE, samples: int = 16) -> float:
+    """
+    Максимальная ошибка интерполяции по таблице относительно полинома
+    (для выбора размера таблицы)
+    :@param table_size: количество узлов таблицы
+    :@param samples: количество проверочных точек на каждый интервал таблицы
+
+    :@return: float: максимальное абсолютное отклонение вероятности
+    """
+    probit = np.linspace(PROBIT_MIN, PROBIT_MAX, (table_size - 1) * samples + 1)
+    deviation = np.abs(probability_interpolated(probit, table_size) - probability_polynomial(probit))
+    return float(deviation.max())
 
 
 class Probit:
 
+    def __init__(self, mode: str = 'polynomial', table_size: int = PROBABILITY_TABLE_SIZE):
+        """
+        :@param mode: способ вычисления вероятности поражения:
+                      'polynomial' - полиномиальная аппроксимация (по умолчанию),
+                      'exact' - функция нормального распределения Ф(Pr - 5),
+                      'table' - интерполяция полинома по таблице
+        :@param table_size: количество узлов таблицы (для mode = 'table')
+
+        :@raise: неизвестный способ вычисления
+        """
+        if mode not in PROBABILITY_MODES:
+            raise ValueError(f'Неизвестный способ вычисления вероятности: {mode}')
+        self.mode = mode
+        self.table_size = table_size
+
     def probit_check(self, probit: float) -> float:
         """Проверка пробит функции:
         значения определены в интервале
         от 2.67 до 8.09"""
-        if probit < 2.67:
+        if probit < PROBIT_MIN:
             probit = 0
-        elif probit > 8.09:
-            probit = 8.09
-        else:
-            probit = probit
+        elif probit > PROBIT_MAX:
+            probit = PROBIT_MAX
         return probit
 
+    def probit_check_vector(self, probit: np.ndarray) -> np.ndarray:
+        """Проверка пробит функции для массива значений:
+        значения меньше 2.67 обнуляются,
+        значения больше 8.09 ограничиваются 8.09"""
+        probit = np.asarray(probit, dtype=float)
+        return np.where(probit < PROBIT_MIN, 0, np.minimum(probit, PROBIT_MAX))
+
     def probability(self, probit: float) -> float:
         """
         Вычисление вероятности поражения
@@ -31,19 +194,90 @@ class Probit:
 
         :@return: float
         """
-        q_vp = -0.00064545 * (probit ** 6) + 0.02327 * (probit ** 5) - \
-               0.33495 * (probit ** 4) + 2.4406 * (probit ** 3) - \
-               9.41 * (probit ** 2) + 18.31 * (probit ** 1) - 14.156
-        # проверка (вероятность гибели не может быть больше 1 и меньше 0
-        if q_vp > 0.99:
-            probability_death = 0.99
-        elif q_vp < 0:
-            probability_death = 0
-        else:
-            probability_death = q_vp
+        if self.mode == 'table' and PROBIT_MIN <= probit <= PROBIT_MAX:
+            # скалярный вызов интерполируется без numpy
+            probability_table(self.table_size)
+            table, slope = _probability_table_lists[self.table_size]
+            position = (probit - PROBIT_MIN) * (self.table_size - 1) / (PROBIT_MAX - PROBIT_MIN)
+            index = min(int(position), self.table_size - 2)
+            q_vp = table[index] + (position - index) * slope[index]
+            return round(min(max(q_vp, 0), 0.99), 3)
+        if self.mode == 'exact':
+            return self.probability_exact(probit)
+
+        # проверка (вероятность гибели не может быть больше 0.99 и меньше 0
+        probability_death = min(max(_horner(probit), 0), 0.99)
 
         return round(probability_death, 3)
 
+    def probability_vector(self, probit: np.ndarray) -> np.ndarray:
+        """
+        Вычисление вероятности поражения для массива значений пробит-функции
+        (способ вычисления задается параметром mode)
+        :@param probit: массив значений пробит-функции
+
+        :@return: np.ndarray
+        """
+        if self.mode == 'exact':
+            return self.probability_exact_vector(probit)
+        if self.mode == 'table':
+            return self.probability_table_vector(probit)
+        return self.probability_polynomial_vector(probit)
+
+    def probability_polynomial_vector(self, probit: np.ndarray) -> np.ndarray:
+        """
+        Вычисление вероятности поражения полиномиальной аппроксимацией
+        (полином вычисляется по схеме Горнера)
+        :@param probit: массив значений пробит-функции
+
+        :@return: np.ndarray
+        """
+        return np.round(probability_polynomial(probit), 3)
+
+    def probability_table_vector(self, probit: np.ndarray) -> np.ndarray:
+        """
+        Вычисление вероятности поражения линейной интерполяцией по таблице
+        значений полинома (таблица строится при первом обращении, ошибку
+        интерполяции для выбранного размера см. probability_table_error)
+        :@param probit: массив значений пробит-функции
+
+        :@return: np.ndarray
+        """
+        return np.round(probability_interpolated(probit, self.table_size), 3)
+
+    def probability_exact(self, probit: float) -> float:
+        """
+        Вычисление вероятности поражения через функцию нормального распределения
+        (ограничение и округление как у полинома)
+        :@param probit: значение пробит-функции
+
+        :@return: float
+        """
+        if probit < PROBIT_MIN:
+            return 0
+        return round(min(0.5 * (1 + math.erf((probit - 5) / math.sqrt(2))), 0.99), 3)
+
+    def probability_exact_vector(self, probit: np.ndarray) -> np.ndarray:
+        """
+        Вычисление вероятности поражения через функцию нормального распределения
+        P = Ф(Pr - 5) (scipy.special.ndtr).
+        Нулевое значение пробит-функции (ниже порога 2.67, см. probit_check) дает 0;
+        как и у полинома, вероятность ограничена 0.99 и округлена до 3 знаков,
+        поэтому способы вычисления взаимозаменяемы.
+        :@param probit: массив значений пробит-функции
+
+        :@return: np.ndarray
+        """
+        probit = np.asarray(probit, dtype=float)
+        # вычисления на месте в одном временном массиве
+        probability_death = np.atleast_1d(probit - 5)
+        ndtr(probability_death, out=probability_death)
+        np.minimum(probability_death, 0.99, out=probability_death)
+        probability_death[np.atleast_1d(probit) < PROBIT_MIN] = 0
+        np.round(probability_death, 3, out=probability_death)
+
+        return probability_death.reshape(probit.shape)
+
     def probit_explosion(self, delta_P: float, impuls: float) -> float:
         """
         Вычисление пробит-функции при взрыве
@@ -56,13 +290,28 @@ class Probit:
         if 0 in (delta_P, impuls):
             raise ValueError('Фукнция не может принимать нулевые параметры')
 
-        delta_P = delta_P * 1000  # кПа -> Па
-        V1 = ((17500 / (delta_P)) ** (8.4)) + ((290 / impuls) ** (9.3))
-        probit = 5 - 0.26 * math.log(V1)
-        probit = self.probit_check(probit)
+        probit = self.probit_check(_probit_explosion(delta_P, impuls, math.log))
 
         return round(probit, 3)
 
+    def probit_explosion_vector(self, delta_P: np.ndarray, impuls: np.ndarray) -> np.ndarray:
+        """
+        Вычисление пробит-функции при взрыве для массивов значений
+        :@param: delta_P: массив избыточного давления, кПа
+        :@param: impuls: массив импульса, Па*с
+
+        :@return: np.ndarray
+        :@raise: Фукнция не может принимать нулевые параметры
+        """
+        delta_P = np.asarray(delta_P, dtype=float)
+        impuls = np.asarray(impuls, dtype=float)
+        if np.any(delta_P == 0) or np.any(impuls == 0):
+            raise ValueError('Фукнция не может принимать нулевые параметры')
+
+        probit = self.probit_check_vector(_probit_explosion(delta_P, impuls, np.log))
+
+        return np.round(probit, 3)
+
     def probit_fireball(self, time: float, q_ball: float) -> float:
         """
         Вычисление пробит-функции при взрыве
@@ -75,52 +324,89 @@ class Probit:
         if 0 in (time, q_ball):
             raise ValueError('Фукнция не может принимать нулевые параметры')
 
-        probit = -12.8 + 2.56 * math.log(time * (q_ball ** (4 / 3)))
-        probit = self.probit_check(probit)
+        probit = self.probit_check(_probit_thermal(time, q_ball, math.log))
 
         return round(probit, 3)
 
+    def probit_fireball_vector(self, time: np.ndarray, q_ball: np.ndarray) -> np.ndarray:
+        """
+        Вычисление пробит-функции при огненном шаре для массивов значений
+        :@param time: время существования, с
+        :@param q_ball: массив интенсивности теплового излучения, кВт/м2
+
+        :@return: np.ndarray
+        :@raise: Фукнция не может принимать нулевые параметры
+        """
+        time = np.asarray(time, dtype=float)
+        q_ball = np.asarray(q_ball, dtype=float)
+        if np.any(time == 0) or np.any(q_ball == 0):
+            raise ValueError('Фукнция не может принимать нулевые параметры')
+
+        probit = self.probit_check_vector(_probit_thermal(time, q_ball, np.log))
+
+        return np.round(probit, 3)
+
     def probit_strait_fire(self, dist: float, q_max: float) -> float:
         """
         Вычисление пробит-функции при пожаре пролива
         :@param dist: расстояние до зоны выхода
         :@param q_max: максимальная интенсивность на заданном расстоянии, кВт/м2
         """
-
-        t0 = 60  # время обнаружения пожара по методике, с
-        speed = 1  # средняя скорость, м/с
-        time = t0 + (dist * 5 / speed)
-        probit = -12.8 + 2.56 * math.log(time * (q_max ** (4 / 3)))
-        probit = self.probit_check(probit)
+        probit = self.probit_check(_probit_thermal(_strait_fire_time(dist), q_max, math.log))
 
         return round(probit, 3)
 
+    def probit_strait_fire_vector(self, dist: np.ndarray, q_max: np.ndarray) -> np.ndarray:
+        """
+        Вычисление пробит-функции при пожаре пролива для массивов значений
+        :@param dist: массив расстояний до зоны выхода
+        :@param q_max: массив максимальной интенсивности на заданном расстоянии, кВт/м2
+        """
+        dist = np.asarray(dist, dtype=float)
+        q_max = np.asarray(q_max, dtype=float)
+
+        probit = self.probit_check_vector(_probit_thermal(_strait_fire_time(dist), q_max, np.log))
+
+        return np.round(probit, 3)
+
     def probit_toxic(self, substance: str, time: float, concentration: float):
         '''
         :@param substance: вещество, напр. "Аммиак"
         :@param time: - время экспозиции мин.
         :@param concentration: - концентрация мг/л
-        (см. Основы моделирования чрезвычайных ситуаций: учеб. пособие
-        / В. Г. Шаптала, В. Ю. Радоуцкий, В. В. Шаптала; под общ. ред.
-        В. Г. Шапталы. – Белгород: Изд-во БГТУ, 2010. – 166 с)
+        (коэффициенты см. TOXIC_SUBSTANCES)
 
         '''
-        data = {
-            'Аммиак': (-35.9, 1.85, 2),
-            'Соляная кислота': (-16.85, 2, 1),
-            'Сероводород': (-31.42, 3.008, 1.43),
-            'Формальдегид': (-12.24, 1.3, 2),
-            'Хлор': (-8.29, 0.92, 2),
-            'Окись этилена': (-6.21, 1, 1),
-        }
+        probit = self.probit_check(_probit_toxic(substance, time, concentration, math.log))
 
-        a,b,n = data[substance] if substance in data.keys() else data['Аммиак']
+        return probit
 
-        probit = a + b * math.log(pow(concentration, n)*time)
-        probit = self.probit_check(probit)
+    def probit_toxic_vector(self, substance: str, time: np.ndarray, concentration: np.ndarray) -> np.ndarray:
+        '''
+        :@param substance: вещество, напр. "Аммиак" (если вещества нет в TOXIC_SUBSTANCES - принимается аммиак)
+        :@param time: - время экспозиции мин. (число или массив)
+        :@param concentration: - массив концентраций мг/л
+        '''
+        time = np.asarray(time, dtype=float)
+        concentration = np.asarray(concentration, dtype=float)
+
+        probit = self.probit_check_vector(_probit_toxic(substance, time, concentration, np.log))
 
         return probit
 
+    def toxic_vector(self, substance: str, time, concentration) -> tuple:
+        '''
+        Пробит-функция и вероятность поражения токсичным веществом для массива концентраций
+        (нулевая концентрация - пробит и вероятность 0)
+        :@param substance: вещество, напр. "Аммиак" (если вещества нет в TOXIC_SUBSTANCES - принимается аммиак)
+        :@param time: - время экспозиции мин. (число или массив)
+        :@param concentration: - массив концентраций мг/л
+
+        :@return: tuple: (probit, probability): массивы np.ndarray
+        '''
+        with np.errstate(divide='ignore'):
+            probit = self.probit_toxic_vector(substance, time, concentration)
+        return (probit, self.probability_vector(probit))
 
 if __name__ == '__main__':
     # ev_class = Probit()
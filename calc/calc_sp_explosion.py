@@ -6,8 +6,108 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 
+import numpy as np
 from calc.calc_probit import Probit
-from calc._found_nearest_value import get_nearest_value
+from calc._found_zone_radius import get_zone_radius
+from calc._result_cache import cached_result
+
+RADIUS_CHUNK = 1000  # количество точек сетки расстояний, считаемых за один векторный проход
+CLASSIFIED_ZONES = (100, 53, 28, 12, 5, 3)  # пороги избыточного давления для зон, кПа
+
+
+class Explosion_scenario:
+    """
+    Подготовленный сценарий взрыва (СП 12.13130-2009), уравнение Садовского.
+    Величины, не зависящие от расстояния (приведенная масса, ее степени и
+    ограничение давления вблизи центра взрыва), вычисляются один раз при создании объекта.
+    """
+
+    def __init__(self, mass: float, heat_of_combustion: float, z: float):
+        """
+        :@param mass: масса испарившегося вещества, кг
+        :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+        :@param z: коэф. участия во взрыве (например z = 0.1)
+
+        :@raise проверка функции на введенные нулевые значения
+        """
+        # Проверки
+        if 0 in (mass, heat_of_combustion, z):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
+        self.mass = mass
+        self.heat_of_combustion = heat_of_combustion
+        self.z = z
+
+        # вычисленные
+        self.M_pr = (heat_of_combustion / 4520) * mass * z
+        self.M_pr_033 = self.M_pr ** 0.33
+        self.M_pr_066 = self.M_pr ** 0.66
+        self.radius_cap = self.cap_radius()
+        self.delta_p_max = self.sadovsky_pressure(self.radius_cap)
+        self.impulse_max = 123 * self.M_pr_066 / self.radius_cap
+
+    def sadovsky_pressure(self, radius):
+        """
+        Избыточное давление по уравнению Садовского (без ограничения)
+        :@param radius: расстояние (или массив расстояний) от геометрического центра взрыва, м
+
+        :@return: delta_p: избыточное давление ВУВ, кПа
+        """
+        return 101.3 * ((0.8 * self.M_pr_033 / radius) + (3 * self.M_pr_066) /
+                        (radius ** 2) + (5 * self.M_pr) / (radius ** 3))
+
+    def cap_radius(self) -> int:
+        """
+        Поиск максимального значения давления и импульса: наименьший целый радиус
+        от 1 до 1999 м, на котором давление меньше 200 кПа (бисекция по монотонной функции)
+
+        :@return: radius_cap: int: радиус, м
+        """
+        low = 1
+        high = 1999
+        if self.sadovsky_pressure(high) >= 200:
+            return high
+        while low < high:
+            middle = (low + high) // 2
+            if self.sadovsky_pressure(middle) < 200:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def pressure_point(self, radius: float) -> float:
+        """
+        Избыточное давление для одного расстояния (без numpy, для поиска радиусов зон)
+        :@param radius: расстояние от геометрического центра взрыва, м
+
+        :@return: delta_p: избыточное давление ВУВ, кПа (без округления)
+        """
+        delta_p = self.sadovsky_pressure(radius)
+        return self.delta_p_max if delta_p > 150 else delta_p
+
+    def pressure_impulse(self, radius: np.ndarray) -> tuple:
+        """
+        Расчет избыточного давления и импульса сразу для массива расстояний
+
+        :@param radius: массив расстояний от геометрического центра взрыва, м
+
+        :@return: tuple: (delta_p, impulse): массивы избыточного давления ВУВ, кПа
+                         и импульса, Па*с (без округления)
+        :@raise проверка функции на введенные нулевые значения
+        """
+        radius = np.asarray(radius, dtype=float)
+        # Проверки
+        if np.any(radius == 0):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
+        delta_p = self.sadovsky_pressure(radius)
+        impulse = 123 * self.M_pr_066 / radius
+
+        cap = delta_p > 150
+        delta_p = np.where(cap, self.delta_p_max, delta_p)
+        impulse = np.where(cap, self.impulse_max, impulse)
+
+        return (delta_p, impulse)
 
 
 class Explosion:
@@ -33,32 +133,17 @@ class Explosion:
         if 0 in (mass, heat_of_combustion, z, radius):
             raise ValueError(f'Фукнция не может принимать нулевые параметры')
 
-        M_pr = (heat_of_combustion / 4520) * mass * z
-        # поиск максимального значения давления и импульса
-        delta_p_max = 0
-        impulse_max = 0
-        for r in range(1, 2000):
-            delta_p_max = 101.3 * ((0.8 * (M_pr ** 0.33) / r) + (3 * (M_pr ** 0.66)) /
-                                   (r ** 2) + (5 * M_pr) / (r ** 3))
-            impulse_max = 123 * (M_pr ** 0.66) / r
-            if delta_p_max < 200:
-                break
-        # расчет в зависимости от радиуса
-        delta_p = 101.3 * ((0.8 * (M_pr ** 0.33) / radius) + (3 * (M_pr ** 0.66)) /
-                           (radius ** 2) + (5 * M_pr) / (radius ** 3))
-        impulse = 123 * (M_pr ** 0.66) / radius
-
-        if delta_p > 150:
-            delta_p = delta_p_max
-            impulse = impulse_max
-
-        delta_p = round(delta_p, 2)
-        impulse = round(impulse, 2)
+        delta_p, impulse = Explosion_scenario(mass, heat_of_combustion, z).pressure_impulse(
+            np.array([radius], dtype=float))
+
+        delta_p = round(float(delta_p[0]), 2)
+        impulse = round(float(impulse[0]), 2)
 
         result = (delta_p, impulse)
 
         return result
 
+    @cached_result
     def explosion_array(self, mass: float, heat_of_combustion: float, z: float) -> tuple:
 
         """
@@ -72,52 +157,88 @@ class Explosion:
         radius_arr = []
         delta_p_arr = []
         impulse_arr = []
-        probit_arr = []
-        probability_arr = []
+
+        scenario = Explosion_scenario(mass, heat_of_combustion, z)
 
         # максимальная взрывная волна
-        radius = 0.1
-        delta_p = self.explosion_point(mass, heat_of_combustion, z, radius)[0]
+        delta_p = round(scenario.pressure_point(0.1), 2)
 
-        # просчитаем значения пока взрыв больше 2.9 кПа
+        # просчитаем значения пока взрыв больше 2.9 кПа,
+        # сетка расстояний (шаг 0.1 м) считается векторно блоками по RADIUS_CHUNK точек
+        start = 1
         while delta_p > 2.9:
-            res = self.explosion_point(mass, heat_of_combustion, z, radius)
-            delta_p = res[0]
-            impulse = res[1]
-            probit = Probit().probit_explosion(delta_p, impulse)
-            probability = Probit().probability(probit)
-            # append
-            radius_arr.append(round(radius, 2))
-            delta_p_arr.append(delta_p)
-            impulse_arr.append(impulse)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
-            radius += 0.1
+            radius_chunk = np.round(np.arange(start, start + RADIUS_CHUNK) * 0.1, 2)
+            delta_p_chunk, impulse_chunk = scenario.pressure_impulse(radius_chunk)
+            delta_p_chunk = np.round(delta_p_chunk, 2)
+            below = np.flatnonzero(delta_p_chunk <= 2.9)
+            stop = below[0] + 1 if below.size else RADIUS_CHUNK
+            radius_arr.extend(radius_chunk[:stop].tolist())
+            delta_p_arr.extend(delta_p_chunk[:stop].tolist())
+            impulse_arr.extend(np.round(impulse_chunk[:stop], 2).tolist())
+            delta_p = delta_p_arr[-1]
+            start += RADIUS_CHUNK
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_explosion_vector(delta_p_arr, impulse_arr)
+        probit_arr = probit.tolist()
+        probability_arr = probit_cls.probability_vector(probit).tolist()
 
         result = (radius_arr, delta_p_arr, impulse_arr, probit_arr, probability_arr)
 
         return result
 
-    def explosion_class_zone(self, mass: float, heat_of_combustion: float, z: float) -> list:
+    @cached_result
+    def explosion_profile(self, mass: float, heat_of_combustion: float, z: float, points: int = 200) -> tuple:
+
         """
+        Профиль поражающих факторов на геометрической сетке расстояний
+        от 0.1 м до границы 2.9 кПа (points точек вместо шага 0.1 м в explosion_array)
+
         :@param mass: масса испарившегося вещества, кг
         :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
         :@param z: коэф. участия во взрыве (например z = 0.1)
+        :@param points: количество точек сетки
+
+        :@return: : tuple: (radius, delta_p, impulse, probit, probability): кортеж массивов np.ndarray
+        """
+        scenario = Explosion_scenario(mass, heat_of_combustion, z)
+        radius_end = get_zone_radius(scenario.pressure_point, 2.9, 0.1)
+
+        if radius_end == 0:
+            empty = np.array([])
+            return (empty, empty, empty, empty, empty)
+
+        radius = np.geomspace(0.1, radius_end, points)
+        delta_p, impulse = scenario.pressure_impulse(radius)
+        delta_p = np.round(delta_p, 2)
+        impulse = np.round(impulse, 2)
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_explosion_vector(delta_p, impulse)
+        probability = probit_cls.probability_vector(probit)
+
+        return (radius, delta_p, impulse, probit, probability)
+
+    @cached_result
+    def explosion_class_zone(self, mass: float, heat_of_combustion: float, z: float,
+                             tolerance: float = 0.01) -> list:
+        """
+        :@param mass: масса испарившегося вещества, кг
+        :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+        :@param z: коэф. участия во взрыве (например z = 0.1)
+        :@param tolerance: точность определения радиусов зон, м
 
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
-        res_list = self.explosion_array(mass, heat_of_combustion, z)
+        scenario = Explosion_scenario(mass, heat_of_combustion, z)
+
+        def delta_p(radius):
+            return round(scenario.pressure_point(radius), 2)
 
         # Calculate classified_zone_array
-        classified_zone_array = [100, 53, 28, 12, 5, 3]  # CZA
-        radius_CZA = []
-        delta_p_array = res_list[1]
-        radius_array = res_list[0]
-
-        for CZA in classified_zone_array:
-            ind = delta_p_array.index(get_nearest_value(delta_p_array, CZA))
-            radius_CZA.append(radius_array[ind])
+        radius_CZA = [get_zone_radius(delta_p, CZA, 0.1, tolerance) for CZA in CLASSIFIED_ZONES]
+
         return radius_CZA
 
 
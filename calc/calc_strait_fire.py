@@ -8,8 +8,13 @@
 # -----------------------------------------------------------
 
 import math
+import numpy as np
 from calc.calc_probit import Probit
-from calc._found_nearest_value import get_nearest_value
+from calc._found_zone_radius import get_zone_radius
+from calc._result_cache import cached_result
+
+RADIUS_CHUNK = 1000  # количество точек сетки расстояний, считаемых за один векторный проход
+CLASSIFIED_ZONES = (10.5, 7.0, 4.2, 1.4)  # пороги интенсивности теплового излучения для зон, кВт/м2
 
 
 class Strait_fire:
@@ -37,18 +42,38 @@ class Strait_fire:
         if 0 in (S_spill, m_sg, mol_mass, wind_velocity, radius):
             raise ValueError(f'Фукнция не может принимать нулевые параметры')
 
+        q_term = self.termal_radiation_vector(S_spill, m_sg, mol_mass, t_boiling,
+                                              wind_velocity, np.array([radius], dtype=float))[0]
+
+        return float(q_term)
+
+    def termal_radiation_vector(self, S_spill: float, m_sg: float, mol_mass: float,
+                                t_boiling: float, wind_velocity: float, radius: np.ndarray) -> np.ndarray:
+
+        """
+        Функция класса для расчета интенсивности теплового излучения
+        сразу для массива расстояний (векторный расчет за один проход)
+
+        :@param S_spill: площадь пролива, м2
+        :@param m_sg: удельная плотность выгорания, кг/(с*м2) (например m_sg = 0.06)
+        :@param mol_mass: молекулярная масса, кг/кмоль (например mol_mass = 95.3)
+        :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
+        :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
+        :@param radius: массив расстояний от геометрического центра пролива, м
+
+        :@return  np.ndarray: q_term: интенсивность теплового излучения, кВт/м2
+        :@raise проверка функции на введенные нулевые значения
+        """
+        radius = np.asarray(radius, dtype=float)
+        # Проверки
+        if 0 in (S_spill, m_sg, mol_mass, wind_velocity) or np.any(radius == 0):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
+        # Параметры пламени не зависят от расстояния и считаются один раз
         # Вычислим эффективный диаметр
         D_eff = math.sqrt(4 * S_spill / math.pi)
 
-        # проведем проверку не попадает ли расчетная точка в пролив
-        if radius < (D_eff / 2 + 0.1):  # попадает
-            # примем радиус на границе пролива, так как методика
-            # не работает внутри пролива, т.е. делается допущение
-            # что внутри пролива интенсивность та же что и на границе
-            radius = (D_eff / 2 + 0.1)
-
         po_steam = mol_mass / (22.413 * (1 + 0.00367 * t_boiling))
-        # print("Пожар", wind_velocity, m_sg, D_eff, po_steam, S_spill)
         u_star = wind_velocity / math.pow((m_sg * 9.8 * D_eff) / po_steam, (1 / 3))
 
         if u_star >= 1:  # L
@@ -60,34 +85,39 @@ class Strait_fire:
         cos_tetta = 1 if u_star < 1 else math.pow(u_star, (-0.5))
 
         tetta = math.acos(cos_tetta)  # in radians
+        sin_t = math.sin(tetta)
+        cos_t = math.cos(tetta)
         a_pr = 2 * flame_length / D_eff
+
+        # проведем проверку не попадает ли расчетная точка в пролив
+        # (методика не работает внутри пролива, т.е. делается допущение
+        # что внутри пролива интенсивность та же что и на границе)
+        radius = np.maximum(radius, D_eff / 2 + 0.1)
+
         b_pr = 2 * radius / D_eff
-        A_pr = math.sqrt(a_pr * a_pr + math.pow(b_pr + 1, 2) - 2 * a_pr * (b_pr + 1) * math.sin(tetta))
-        B_pr = math.sqrt(a_pr * a_pr + math.pow(b_pr - 1, 2) - 2 * a_pr * (b_pr - 1) * math.sin(tetta))
-        C_pr = math.sqrt(1 + (math.pow(b_pr, 2) - 1) * math.pow(math.cos(tetta), 2))
-        D_pr = math.sqrt((b_pr - 1) / (b_pr + 1))
-        E_pr = (a_pr * math.cos(tetta)) / (b_pr - a_pr * math.sin(tetta))
-        F_pr = math.sqrt(math.pow(b_pr, 2) - 1)
-
-        Fv = (1 / math.pi) * (-E_pr * math.atan(D_pr) +
-                              E_pr * ((math.pow(a_pr, 2) + math.pow(b_pr + 1, 2) - 2 * b_pr * (
-                        1 + a_pr * math.sin(tetta))) / (A_pr * B_pr)) *
-                              math.atan((A_pr * D_pr) / B_pr) + (math.cos(tetta) / C_pr) *
-                              (math.atan((a_pr * b_pr - F_pr * F_pr * math.sin(tetta)) / (F_pr * C_pr)) +
-                               math.atan(F_pr * F_pr * math.sin(tetta) / (F_pr * C_pr))))
+        A_pr = np.sqrt(a_pr * a_pr + (b_pr + 1) ** 2 - 2 * a_pr * (b_pr + 1) * sin_t)
+        B_pr = np.sqrt(a_pr * a_pr + (b_pr - 1) ** 2 - 2 * a_pr * (b_pr - 1) * sin_t)
+        C_pr = np.sqrt(1 + (b_pr ** 2 - 1) * cos_t ** 2)
+        D_pr = np.sqrt((b_pr - 1) / (b_pr + 1))
+        E_pr = (a_pr * cos_t) / (b_pr - a_pr * sin_t)
+        F_pr = np.sqrt(b_pr ** 2 - 1)
+
+        atan_AD_B = np.arctan((A_pr * D_pr) / B_pr)
+        atan_F = (np.arctan((a_pr * b_pr - F_pr * F_pr * sin_t) / (F_pr * C_pr)) +
+                  np.arctan(F_pr * F_pr * sin_t / (F_pr * C_pr)))
+
+        Fv = (1 / math.pi) * (-E_pr * np.arctan(D_pr) +
+                              E_pr * ((a_pr ** 2 + (b_pr + 1) ** 2 - 2 * b_pr * (1 + a_pr * sin_t)) /
+                                      (A_pr * B_pr)) * atan_AD_B + (cos_t / C_pr) * atan_F)
 
         Fh = (1 / math.pi) * (
-                math.atan(1 / D_pr) + (math.sin(tetta) / C_pr) *
-                (math.atan((a_pr * b_pr - F_pr * F_pr * math.sin(tetta)) / (F_pr * C_pr)) +
-                 math.atan((math.pow(F_pr, 2) * math.sin(tetta)) / (F_pr * C_pr))) -
-                ((math.pow(a_pr, 2) + math.pow(b_pr + 1, 2) - 2 * (b_pr + 1 + a_pr * b_pr * math.sin(tetta))) / (
-                        A_pr * B_pr)) *
-                math.atan(A_pr * D_pr / B_pr)
+                np.arctan(1 / D_pr) + (sin_t / C_pr) * atan_F -
+                ((a_pr ** 2 + (b_pr + 1) ** 2 - 2 * (b_pr + 1 + a_pr * b_pr * sin_t)) / (A_pr * B_pr)) * atan_AD_B
         )
 
-        Fq = math.sqrt(math.pow(Fv, 2) + math.pow(Fh, 2))
+        Fq = np.sqrt(Fv ** 2 + Fh ** 2)
 
-        tay = math.exp(-7 * math.pow(10, -4) * (radius - 0.5 * D_eff))
+        tay = np.exp(-7 * math.pow(10, -4) * (radius - 0.5 * D_eff))
 
         E_f = 25
 
@@ -95,6 +125,7 @@ class Strait_fire:
 
         return q_term
 
+    @cached_result
     def termal_radiation_array(self, S_spill: float, m_sg: float, mol_mass: float,
                                t_boiling: float, wind_velocity: float) -> tuple:
 
@@ -110,20 +141,24 @@ class Strait_fire:
 
         radius_arr = []
         q_term_arr = []
-        probit_arr = []
-        probability_arr = []
 
         # максимальная интенсивность теплового излучения
         radius = 0.1
         q_term = self.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius)
 
-        # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2
+        # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2,
+        # сетка расстояний (шаг 0.1 м) считается векторно блоками по RADIUS_CHUNK точек
+        start = 1
         while q_term > 1.2:
-            q_term = round(self.termal_radiation_point(S_spill, m_sg, mol_mass,
-                                                       t_boiling, wind_velocity, radius), 2)
-            q_term_arr.append(q_term)
-            radius_arr.append(round(radius, 2))
-            radius += 0.1
+            radius_chunk = np.round(np.arange(start, start + RADIUS_CHUNK) * 0.1, 2)
+            q_chunk = np.round(self.termal_radiation_vector(S_spill, m_sg, mol_mass, t_boiling,
+                                                            wind_velocity, radius_chunk), 2)
+            below = np.flatnonzero(q_chunk <= 1.2)
+            stop = below[0] + 1 if below.size else RADIUS_CHUNK
+            radius_arr.extend(radius_chunk[:stop].tolist())
+            q_term_arr.extend(q_chunk[:stop].tolist())
+            q_term = q_term_arr[-1]
+            start += RADIUS_CHUNK
         # расчитаем пробит функцию и вероятность поражения
         D_eff = (4 * S_spill / 3.14) ** (1 / 2)
         # Определим расстояние на котором интенсивность = 4 кВт/м2
@@ -133,49 +168,95 @@ class Strait_fire:
                 r_4_kw = radius_arr[q_term_arr.index(q)]
                 break
 
-        for i in radius_arr:
-            dist = r_4_kw - i  # расстояние до точки на которой интенсивность = 4 кВт/м2
-
-            if i < D_eff:
-                probit = 8.09
-                probability = 0.99
-            elif dist < 0:
-                probit = 0
-                probability = 0
-            else:
-                probit = Probit().probit_strait_fire(dist, q_term_arr[radius_arr.index(i)])
-                probability = Probit().probability(probit)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
+        radius_np = np.array(radius_arr)
+        dist = r_4_kw - radius_np  # расстояние до точки на которой интенсивность = 4 кВт/м2
+        inside = radius_np < D_eff
+        outside = dist < 0
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_strait_fire_vector(np.maximum(dist, 0), q_term_arr)
+        probability = probit_cls.probability_vector(probit)
+
+        probit_arr = np.where(inside, 8.09, np.where(outside, 0, probit)).tolist()
+        probability_arr = np.where(inside, 0.99, np.where(outside, 0, probability)).tolist()
 
         result = (radius_arr, q_term_arr, probit_arr, probability_arr)
 
         return result
 
+    @cached_result
+    def termal_radiation_profile(self, S_spill: float, m_sg: float, mol_mass: float,
+                                 t_boiling: float, wind_velocity: float, points: int = 200) -> tuple:
+
+        """
+        Профиль на геометрической сетке расстояний от 0.1 м до границы 1.2 кВт/м2
+        (points точек вместо шага 0.1 м в termal_radiation_array). Вероятность поражения
+        меняется скачком на границе пролива и на расстоянии 4 кВт/м2 - узлы сетки
+        ставятся с обеих сторон скачков
+
+        :@param S_spill: площадь пролива, м2
+        :@param m_sg: удельная плотность выгорания, кг/(с*м2) (например m_sg = 0.06)
+        :@param mol_mass: молекулярная масса, кг/кмоль (например mol_mass = 95.3)
+        :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
+        :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
+        :@param points: количество точек сетки
+
+        :@return: : tuple: (radius, q_term, probit, probability): кортеж массивов np.ndarray
+        """
+
+        def q_term(radius):
+            return self.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius)
+
+        radius_end = get_zone_radius(q_term, 1.2, 0.1)
+
+        if radius_end == 0:
+            empty = np.array([])
+            return (empty, empty, empty, empty)
+
+        D_eff = (4 * S_spill / 3.14) ** (1 / 2)
+        # расстояние, на котором интенсивность = 4 кВт/м2
+        r_4_kw = get_zone_radius(q_term, 4, 0.1)
+
+        edges = np.array([D_eff, r_4_kw])
+        radius = np.unique(np.concatenate((np.geomspace(0.1, radius_end, points), edges, np.nextafter(edges, 0))))
+        radius = radius[(radius >= 0.1) & (radius <= radius_end)]
+
+        q_term_arr = np.round(self.termal_radiation_vector(S_spill, m_sg, mol_mass, t_boiling,
+                                                           wind_velocity, radius), 2)
+
+        dist = r_4_kw - radius  # расстояние до точки на которой интенсивность = 4 кВт/м2
+        inside = radius < D_eff
+        outside = dist < 0
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_strait_fire_vector(np.maximum(dist, 0), q_term_arr)
+        probability = probit_cls.probability_vector(probit)
+
+        probit = np.where(inside, 8.09, np.where(outside, 0, probit))
+        probability = np.where(inside, 0.99, np.where(outside, 0, probability))
+
+        return (radius, q_term_arr, probit, probability)
+
+    @cached_result
     def termal_class_zone(self, S_spill: float, m_sg: float, mol_mass: float,
-                          t_boiling: float, wind_velocity: float):
+                          t_boiling: float, wind_velocity: float, tolerance: float = 0.01):
         """
         :@param S_spill: площадь пролива, м2
         :@param m_sg: удельная плотность выгорания, кг/(с*м2) (например m_sg = 0.06)
         :@param mol_mass: молекулярная масса, кг/кмоль (например mol_mass = 95.3)
         :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
         :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
+        :@param tolerance: точность определения радиусов зон, м
 
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
-        res_list = self.termal_radiation_array(S_spill, m_sg, mol_mass,
-                                               t_boiling, wind_velocity)
+        def q_term(radius):
+            return self.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius)
 
         # Calculate classified_zone_array
-        classified_zone_array = [10.5, 7.0, 4.2, 1.4]  # CZA
-        radius_CZA = []
-        q_term_array = res_list[1]
-        radius_array = res_list[0]
-
-        for CZA in classified_zone_array:
-            ind = q_term_array.index(get_nearest_value(q_term_array, CZA))
-            radius_CZA.append(radius_array[ind])
+        radius_CZA = [get_zone_radius(q_term, CZA, 0.1, tolerance) for CZA in CLASSIFIED_ZONES]
+
         return radius_CZA
 
 
@@ -6,8 +6,14 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 
+import numpy as np
 from calc.calc_probit import Probit
-from calc._found_nearest_value import get_nearest_value
+from calc._found_zone_radius import get_zone_radius
+from calc._result_cache import cached_result
+
+RADIUS_CHUNK = 10000  # количество точек сетки расстояний, считаемых за один векторный проход
+MAX_REFINE = 20  # максимальное количество уточнений адаптивной сетки
+CLASSIFIED_ZONES = (100, 53, 28, 12, 5, 3)  # пороги избыточного давления для зон, кПа
 
 
 class Explosion:
@@ -38,6 +44,21 @@ class Explosion:
 
         return v_burn_rate
 
+    def energy(self, mass: float, heat_of_combustion: float, energy_level: int) -> float:
+        """
+        :@param mass: масса испарившегося вещества, кг
+        :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+        :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
+
+        :@return: : float: E: эффективный энергозапас ТВС, Дж
+        """
+        E = mass * heat_of_combustion * energy_level * 1000
+
+        if E < 1:
+            E = 0.1 * heat_of_combustion * energy_level * 1000
+
+        return E
+
     def explosion_point(self, class_substance: int, view_space: int, mass: float,
                         heat_of_combustion: float, sigma: int, energy_level: int, radius: float) -> tuple:
 
@@ -60,21 +81,49 @@ class Explosion:
         if 0 in (class_substance, view_space, mass, heat_of_combustion, sigma, energy_level, radius):
             raise ValueError(f'Фукнция не может принимать нулевые параметры')
 
+        delta_p, impulse = self.explosion_vector(class_substance, view_space, mass, heat_of_combustion,
+                                                 sigma, energy_level, np.array([radius], dtype=float))
+
+        delta_p = round(float(delta_p[0]), 2)
+        impulse = round(float(impulse[0]), 2)
+
+        res = (delta_p, impulse)
+
+        return res
+
+    def explosion_vector(self, class_substance: int, view_space: int, mass: float,
+                         heat_of_combustion: float, sigma: int, energy_level: int, radius: np.ndarray) -> tuple:
+
+        """
+        Расчет избыточного давления и импульса сразу для массива расстояний
+        (скорость горения и энергозапас считаются один раз на сценарий)
+
+        :@param class_substance: класс взрывоопасности вещества (1-4)
+        :@param view_space: класс окружающего пространства (1-4)
+        :@param mass: масса испарившегося вещества, кг
+        :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+        :@param sigma: тип смеси  (4- парогазовая, 7 - газовая)
+        :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
+        :@param radius: массив расстояний от геометрического центра взрыва, м
+
+        :@return: : tuple: (delta_p, impulse): массивы избыточного давления ВУВ, кПа и импульса, Па*с
+                  (без округления)
+
+        :@raise проверка функции на введенные нулевые значения
+        """
+        radius = np.asarray(radius, dtype=float)
+        # Проверки
+        if 0 in (class_substance, view_space, mass, heat_of_combustion, sigma, energy_level) or np.any(radius == 0):
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
         class_substance = int(class_substance)
         view_space = int(view_space)
 
         v_burn_rate = self.burn_rate(class_substance, view_space, mass)
 
-        E = mass * heat_of_combustion * energy_level * 1000
+        E = self.energy(mass, heat_of_combustion, energy_level)
 
-        if E < 1:
-            E = 0.1 * heat_of_combustion * energy_level * 1000
-
-        Rx = radius / ((E / 101300) ** (1 / 3))
-        if Rx > 0.34:
-            Rx = radius / ((E / 101300) ** (1 / 3))
-        elif Rx <= 0.34:
-            Rx = 0.34
+        Rx = np.maximum(radius / ((E / 101300) ** (1 / 3)), 0.34)
 
         delta_p = ((v_burn_rate / 340) ** 2) * \
                   (((sigma - 1) / sigma) * ((0.83 / Rx) - 0.14 / (Rx ** 2))) * 101.3
@@ -84,13 +133,9 @@ class Explosion:
                   (0.06 / Rx + 0.01 / (Rx ** 2) - 0.0025 / (Rx ** 3)) * \
                   (101325 ** (2 / 3)) * (E ** (1 / 3)) / 340
 
-        delta_p = round(delta_p, 2)
-        impulse = round(impulse, 2)
-
-        res = (delta_p, impulse)
-
-        return res
+        return (delta_p, impulse)
 
+    @cached_result
     def explosion_array(self, class_substance: int, view_space: int, mass: float,
                         heat_of_combustion: float, sigma: int, energy_level: int) -> tuple:
 
@@ -108,8 +153,6 @@ class Explosion:
         radius_arr = []
         delta_p_arr = []
         impulse_arr = []
-        probit_arr = []
-        probability_arr = []
 
         # максимальная избыточное давление
         radius = 0.001
@@ -117,29 +160,97 @@ class Explosion:
                                        mass, heat_of_combustion, sigma,
                                        energy_level, radius)[0]
 
-        # просчитаем значения пока взрыв больше 2.9 кПА
+        # просчитаем значения пока взрыв больше 2.9 кПА,
+        # сетка расстояний (шаг 0.001 м) считается векторно блоками по RADIUS_CHUNK точек
+        start = 1
         while delta_p > 2.9:
-            res = self.explosion_point(class_substance, view_space,
-                                       mass, heat_of_combustion, sigma,
-                                       energy_level, radius)
-            delta_p = res[0]
-            impulse = res[1]
-            probit = round(Probit().probit_explosion(delta_p, impulse), 3)
-            probability = round(Probit().probability(probit), 3)
-            # append
-            radius_arr.append(float(radius))
-            delta_p_arr.append(delta_p)
-            impulse_arr.append(impulse)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
-            radius += 0.001
+            radius_chunk = np.round(np.arange(start, start + RADIUS_CHUNK) * 0.001, 3)
+            delta_p_chunk, impulse_chunk = self.explosion_vector(class_substance, view_space,
+                                                                 mass, heat_of_combustion, sigma,
+                                                                 energy_level, radius_chunk)
+            delta_p_chunk = np.round(delta_p_chunk, 2)
+            below = np.flatnonzero(delta_p_chunk <= 2.9)
+            stop = below[0] + 1 if below.size else RADIUS_CHUNK
+            radius_arr.extend(radius_chunk[:stop].tolist())
+            delta_p_arr.extend(delta_p_chunk[:stop].tolist())
+            impulse_arr.extend(np.round(impulse_chunk[:stop], 2).tolist())
+            delta_p = delta_p_arr[-1]
+            start += RADIUS_CHUNK
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_explosion_vector(delta_p_arr, impulse_arr)
+        probit_arr = probit.tolist()
+        probability_arr = probit_cls.probability_vector(probit).tolist()
 
         result = (radius_arr, delta_p_arr, impulse_arr, probit_arr, probability_arr)
 
         return result
 
+    @cached_result
+    def explosion_profile(self, class_substance: int, view_space: int, mass: float,
+                          heat_of_combustion: float, sigma: int, energy_level: int,
+                          points: int = 200, tolerance: float = None) -> tuple:
+
+        """
+        Профиль поражающих факторов на адаптивной сетке расстояний:
+        постоянное давление в пределах Rx <= 0.34 описывается двумя точками,
+        далее шаг растет в геометрической прогрессии до границы 2.9 кПа.
+        При заданной точности tolerance интервалы сетки дробятся пополам, пока
+        отклонение линейной интерполяции давления в середине интервала больше tolerance.
+
+        :@param class_substance: класс взрывоопасности вещества (1-4)
+        :@param view_space: класс окружающего пространства (1-4)
+        :@param mass: масса испарившегося вещества, кг
+        :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+        :@param sigma: тип смеси  (4- парогазовая, 7 - газовая)
+        :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
+        :@param points: количество точек геометрической сетки
+        :@param tolerance: допустимая ошибка интерполяции давления, кПа (None - без уточнения сетки)
+
+        :@return: : tuple: (radius, delta_p, impulse, probit, probability): кортеж массивов np.ndarray
+        """
+
+        def delta_p_vector(radius):
+            return self.explosion_vector(class_substance, view_space, mass, heat_of_combustion,
+                                         sigma, energy_level, radius)[0]
+
+        radius_min = 0.001
+        # граница зоны постоянного давления (Rx = 0.34)
+        radius_knee = 0.34 * ((self.energy(mass, heat_of_combustion, energy_level) / 101300) ** (1 / 3))
+        # граница расчета (2.9 кПа)
+        radius_end = get_zone_radius(lambda r: delta_p_vector(np.array([r]))[0], 2.9, radius_min, 0.001)
+
+        if radius_end <= radius_knee:
+            empty = np.array([])
+            return (empty, empty, empty, empty, empty)
+
+        radius = np.concatenate(([radius_min], np.geomspace(radius_knee, radius_end, points)))
+
+        if tolerance is not None:
+            for _ in range(MAX_REFINE):
+                delta_p = delta_p_vector(radius)
+                middle = (radius[:-1] + radius[1:]) / 2
+                error = np.abs(delta_p_vector(middle) - (delta_p[:-1] + delta_p[1:]) / 2)
+                refine = error > tolerance
+                if not refine.any():
+                    break
+                radius = np.sort(np.concatenate((radius, middle[refine])))
+
+        delta_p, impulse = self.explosion_vector(class_substance, view_space, mass, heat_of_combustion,
+                                                 sigma, energy_level, radius)
+        delta_p = np.round(delta_p, 2)
+        impulse = np.round(impulse, 2)
+
+        probit_cls = Probit()
+        probit = probit_cls.probit_explosion_vector(delta_p, impulse)
+        probability = probit_cls.probability_vector(probit)
+
+        return (radius, delta_p, impulse, probit, probability)
+
+    @cached_result
     def explosion_class_zone(self, class_substance: int, view_space: int, mass: float,
-                             heat_of_combustion: float, sigma: int, energy_level: int) -> list:
+                             heat_of_combustion: float, sigma: int, energy_level: int,
+                             tolerance: float = 0.01) -> list:
         """
         :@param class_substance: класс взрывоопасности вещества (1-4)
         :@param view_space: класс окружающего пространства (1-4)
@@ -147,28 +258,18 @@ class Explosion:
         :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
         :@param sigma: тип смеси  (4- парогазовая, 7 - газовая)
         :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
+        :@param tolerance: точность определения радиусов зон, м
 
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
-        res_list = self.explosion_array(class_substance, view_space,
-                                        mass, heat_of_combustion, sigma,
-                                        energy_level)
+        def delta_p(radius):
+            return self.explosion_point(class_substance, view_space, mass, heat_of_combustion,
+                                        sigma, energy_level, radius)[0]
 
         # Calculate classified_zone_array
-        classified_zone_array = [100, 53, 28, 12, 5, 3]  # CZA
-        radius_CZA = []
-        delta_p_array = res_list[1]
-        radius_array = res_list[0]
-
-        for CZA in classified_zone_array:
-            if len(delta_p_array) == 0:
-                radius_CZA.append(0)
-            elif CZA > delta_p_array[0]:
-                radius_CZA.append(0)
-            else:
-                ind = delta_p_array.index(get_nearest_value(delta_p_array, CZA))
-                radius_CZA.append(radius_array[ind])
+        radius_CZA = [get_zone_radius(delta_p, CZA, 0.001, tolerance) for CZA in CLASSIFIED_ZONES]
+
         return radius_CZA
 
 
@@ -0,0 +1,188 @@
+# -----------------------------------------------------------
+# Перечень методик, их параметров и расчет сводных результатов
+# без графического интерфейса (используется GUI и пакетным расчетом)
+#
+# (C) 2023 Kuznetsov Konstantin, Kazan , Russian Federation
+# email kuznetsovkm@yandex.ru
+# -----------------------------------------------------------
+
+from calc import calc_strait_fire
+from calc import calc_lower_concentration
+from calc import calc_fireball
+from calc import calc_sp_explosion
+from calc import calc_tvs_explosion
+from calc import calc_light_gas_disp
+from calc import calc_heavy_gas_disp
+from calc import calc_gas_outflow_small_hole  # истечение газ-емкость
+from calc import calc_gas_outflow_big_hole  # истечение газ-труба на разрыв
+from calc import calc_liguid_outflow_tank
+from calc import calc_liguid_outflow_pipe
+from calc import calc_liguid_evaporation
+from calc import calc_evaporation_LPG
+from calc import calc_liquid_overflow
+from calc import calc_damage
+
+METODS_AND_PARAMETRS = {
+    'Пожар пролива': ('Площадь, м2', 'm, кг/(с*м2) ', 'Mmol, кг/кмоль', 'Ткип, град.С', 'Ветер, м/с'),
+    'Пожар-вспышка': ('Масса, кг', 'Mmol, кг/кмоль', 'Ткип, град.С', 'НКПР, об.%'),
+    'Огненный шар': ('Масса, кг', 'Ef, кВт/м2'),
+    'Взрыв (СП 12.13130-2009)': ('Масса, кг', 'Qсг, кДж/кг ', 'z, -'),
+    'Взрыв (Методика ТВС)': ('Класс в-ва', 'Класс прост-ва', 'Масса, кг', 'Qсг, кДж/кг', 'sigma, -', 'Энергозапас, -'),
+    'Легкий газ': (
+        'Тем-ра воздуха, град. С', 'Облачность (0-8)', 'Cкорость ветра, м/с', 'Ночь (0/1)',
+        'Городская застройка (0/1)', 'Высота выброса, м', 'Тем-ра газа, град. С', 'Масса газа, кг',
+        'Расход газа, кг/с', 'Время отсечения, с', 'Молекулярная масса, кг/кмоль'),
+    'Тяжелый газ (перв.облако)': (
+        'Скорость ветра, м/с', 'Плотность воздуха, кг/м3', 'Плотность газа, кг/м3', 'Объем газа, м3'),
+    'Тяжелый газ (втор.облако)': (
+        'Скорость ветра, м/с', 'Плотность воздуха, кг/м3', 'Плотность газа, кг/м3', 'Расход газа, кг/с',
+        'Радиус выброса, м'),
+    'Истечение газа (емк.)': (
+        'Объем емк., м3', 'Давление, МПа', 'Тем-ра газа, град. С', 'Молекулярная масса, кг/кмоль', 'Коэф. адиабаты, -',
+        'Диаметр отверстия, мм'),
+    'Истечение газа (труб.)': (
+        'Диаметр трубопровода, м', 'Длина трубопровода, м', 'Давление, МПа', 'Тем-ра газа, град. С',
+        'Молекулярная масса, кг/кмоль', 'Коэф. адиабаты, -'),
+    'Истечение жидкости (емк.)': (
+        'Объем емк., м3', 'Высота взлива, м', 'Давление, МПа',
+        'Степень заполнения,-', ' Диаметр отверстия, мм', 'Плотность жидкости, кг/м3'),
+    'Истечение жидкости (труб.)': (
+        'Давление, МПа', 'Высот.отм. z1, м', 'Высот.отм. z2, м', ' Диаметр трубы, мм', 'Плотность жидкости, кг/м3',
+        'Длина трубопровода, м', ' Диаметр отверстия, мм', ' Время отключения давления, с',
+        ' Время закрытия арматуры, с'),
+    'Испарение жидкости': ('Давление пара, кПа', 'Молярная масса, кг/кмоль', 'Площадь пролива, м2'),
+    'Испарение СУГ': ('Молярная масса, кг/кмоль', 'Площадь пролива, м2', 'Скорость ветра, м/с', 'Тем-ра газа, град. С',
+                      'Тем-ра поверхности, град. С'),
+    'Гидродинамический перелив': ('Высота столба жидкости, м', 'Объем жидкости, м3',
+                                  'Расстояние до обвалования, м', 'Высота отбортовки, м'),
+    'Эконом.ущерб': ('Кол-во погибщих, чел', 'Кол-во пострадавших, чел', 'Аварийный объем, м3', 'Диаметр тр-да, мм',
+                      'Длина тр-да, м', 'Степень уничтожения (0...1)','Исп. масса, т', 'Масса пролива, т','Площадь пролива, м2',)
+}
+
+
+def zones(thresholds: tuple, radius: list) -> dict:
+    """
+    Сопоставление порогов поражающего фактора и радиусов зон
+    :param thresholds: - пороги поражающего фактора
+    :param radius: - радиусы зон, м
+    :return: словарь {порог: радиус}
+    """
+    return {str(threshold): float(r) for threshold, r in zip(thresholds, radius)}
+
+
+def strait_fire(data: list) -> dict:
+    radius = calc_strait_fire.Strait_fire().termal_class_zone(*data)
+    return {'zones': zones(calc_strait_fire.CLASSIFIED_ZONES, radius)}
+
+
+def lower_concentration(data: list) -> dict:
+    radius = calc_lower_concentration.LCLP().lower_concentration_limit(*data)
+    return {'radius_lclp': radius[0], 'radius_flash': radius[1]}
+
+
+def fireball(data: list) -> dict:
+    radius = calc_fireball.Fireball().termal_class_zone(*data)
+    return {'zones': zones(calc_fireball.CLASSIFIED_ZONES, radius)}
+
+
+def sp_explosion(data: list) -> dict:
+    radius = calc_sp_explosion.Explosion().explosion_class_zone(*data)
+    return {'zones': zones(calc_sp_explosion.CLASSIFIED_ZONES, radius)}
+
+
+def tvs_explosion(data: list) -> dict:
+    radius = calc_tvs_explosion.Explosion().explosion_class_zone(*data)
+    return {'zones': zones(calc_tvs_explosion.CLASSIFIED_ZONES, radius)}
+
+
+def light_gas(data: list) -> dict:
+    dist, conc, dose = calc_light_gas_disp.Source(*data).result()
+    return {'distance_max': float(dist[-1]), 'concentration_max': float(max(conc)), 'dose_max': float(max(dose))}
+
+
+def heavy_gas_instantaneous(data: list) -> dict:
+    dose, conc, dist, width, time = calc_heavy_gas_disp.Instantaneous_source(*data).result()
+    return {'dose': dose, 'concentration': conc, 'distance': dist, 'width': width, 'time': time}
+
+
+def heavy_gas_continuous(data: list) -> dict:
+    dose, conc, dist, width = calc_heavy_gas_disp.Continuous_source(*data).result()
+    return {'dose': dose, 'concentration': conc, 'distance': dist, 'width': width}
+
+
+def gas_outflow_tank(data: list) -> dict:
+    weight, time, _, _, pressure, mass_flow_rate, _, _ = calc_gas_outflow_small_hole.Outflow(*data).result()
+    return {'time_end': time[-1], 'flow_rate_init': mass_flow_rate[0],
+            'mass_release': weight[0] - weight[-1], 'pressure_end': pressure[-1]}
+
+
+def gas_outflow_pipe(data: list) -> dict:
+    time, mass_flow_rate = calc_gas_outflow_big_hole.Outflow(*data).result()
+    return {'time_end': time[-1], 'flow_rate_init': mass_flow_rate[0]}
+
+
+def liquid_outflow_tank(data: list) -> dict:
+    _, time, _, _, _, flow_rate, _, mass_leaking = calc_liguid_outflow_tank.Outflow(*data).result()
+    return {'time_end': time[-1], 'flow_rate_init': flow_rate[0], 'mass_spill': mass_leaking[-1]}
+
+
+def liquid_outflow_pipe(data: list) -> dict:
+    _, time, flow_rate = calc_liguid_outflow_pipe.Outflow_in_one_section_pipe(*data).result()
+    return {'time_end': time[-1], 'mass_spill': sum(flow_rate)}
+
+
+def liquid_evaporation(data: list) -> dict:
+    _, evaporation = calc_liguid_evaporation.Liquid_evaporation().evaporation_array(*data)
+    return {'mass_evaporation': evaporation[-1]}
+
+
+def lpg_evaporation(data: list) -> dict:
+    _, evaporation = calc_evaporation_LPG.LPG_evaporation(*data).evaporation_array()
+    return {'mass_evaporation': evaporation[-1]}
+
+
+def liquid_overflow(data: list) -> dict:
+    res = calc_liquid_overflow.LIGUID_OVERFLOW(*data).overflow_in_moment()
+    return {'overflow_percent': max(res[5])}
+
+
+def damage(data: list) -> dict:
+    res = calc_damage.Damage(*data).sum_damage()
+    return {'damage_sum': sum(res), 'socio_economic': res[0], 'direct': res[1],
+            'localization': res[2], 'environmental': res[3]}
+
+
+METHODS_CALCULATION = {
+    'Пожар пролива': strait_fire,
+    'Пожар-вспышка': lower_concentration,
+    'Огненный шар': fireball,
+    'Взрыв (СП 12.13130-2009)': sp_explosion,
+    'Взрыв (Методика ТВС)': tvs_explosion,
+    'Легкий газ': light_gas,
+    'Тяжелый газ (перв.облако)': heavy_gas_instantaneous,
+    'Тяжелый газ (втор.облако)': heavy_gas_continuous,
+    'Истечение газа (емк.)': gas_outflow_tank,
+    'Истечение газа (труб.)': gas_outflow_pipe,
+    'Истечение жидкости (емк.)': liquid_outflow_tank,
+    'Истечение жидкости (труб.)': liquid_outflow_pipe,
+    'Испарение жидкости': liquid_evaporation,
+    'Испарение СУГ': lpg_evaporation,
+    'Гидродинамический перелив': liquid_overflow,
+    'Эконом.ущерб': damage,
+}
+
+
+def calculate(method: str, data: list) -> dict:
+    """
+    Расчет сводных результатов по методике (без построения графиков)
+    :param method: - наименование методики (ключ METODS_AND_PARAMETRS)
+    :param data: - список значений параметров в порядке METODS_AND_PARAMETRS
+    :return: словарь сводных результатов (радиусы зон, массы, расходы и т.д.)
+    :raise: неизвестная методика или неверное количество параметров
+    """
+    if method not in METHODS_CALCULATION:
+        raise ValueError(f'Неизвестная методика: {method}')
+    if len(data) != len(METODS_AND_PARAMETRS[method]):
+        raise ValueError(f'Методика "{method}" принимает {len(METODS_AND_PARAMETRS[method])} параметров, '
+                         f'передано {len(data)}')
+    return METHODS_CALCULATION[method](list(data))
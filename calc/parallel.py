@@ -0,0 +1,155 @@
+# -----------------------------------------------------------
+# Параллельный расчет серии сценариев в нескольких процессах
+# (concurrent.futures.ProcessPoolExecutor)
+#
+# Сценарии передаются в процессы пакетами по chunk_size штук,
+# результаты возвращаются в порядке исходных сценариев.
+# Ошибка одного сценария не прерывает расчет остальных.
+# -----------------------------------------------------------
+
+import os
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+
+@contextmanager
+def time_limit(timeout: float = None):
+    """
+    Ограничение времени расчета (через SIGALRM, только для ОС, где он есть, например Linux;
+    в остальных случаях ограничение не действует)
+    :param timeout: - время, с (None - без ограничения)
+    :raise: TimeoutError при превышении времени
+    """
+    if timeout is None or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TimeoutError(f'Превышено время расчета {timeout} с')
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_item(func, item, timeout: float = None) -> tuple:
+    """
+    Расчет одного сценария с перехватом ошибки
+    :param func: - функция расчета сценария
+    :param item: - сценарий (аргумент функции)
+    :param timeout: - ограничение времени расчета, с
+    :return: (result, error): результат и None, либо None и текст ошибки
+    """
+    try:
+        with time_limit(timeout):
+            return (func(item), None)
+    except Exception as error:
+        return (None, f'{type(error).__name__}: {error}')
+
+
+def run_chunk(func, chunk: list, timeout: float = None) -> list:
+    """
+    Расчет пакета сценариев в одном процессе
+    :return: список (result, error) по каждому сценарию пакета
+    """
+    return [run_item(func, item, timeout) for item in chunk]
+
+
+def retry_chunk(func, chunk: list, timeout: float = None) -> list:
+    """
+    Пересчет пакета, процесс которого аварийно завершился: сценарии считаются по одному
+    в отдельном процессе, поэтому ошибку получает только сценарий, на котором процесс
+    завершился (после аварии процесс создается заново)
+    :return: список (result, error) по каждому сценарию пакета
+    """
+    res = []
+    executor = None
+    try:
+        for item in chunk:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=1)
+            try:
+                res.append(executor.submit(run_item, func, item, timeout).result())
+            except BrokenProcessPool as error:
+                res.append((None, f'{type(error).__name__}: {error}'))
+                executor.shutdown(wait=False)
+                executor = None
+            except Exception as error:
+                res.append((None, f'{type(error).__name__}: {error}'))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return res
+
+
+def chunks(items, chunk_size: int):
+    """
+    Разбиение итератора сценариев на пакеты
+    :return: генератор списков сценариев
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parallel_map(func, items, workers: int = None, chunk_size: int = 64, timeout: float = None):
+    """
+    Параллельный расчет сценариев с сохранением порядка результатов
+
+    :param func: - функция расчета одного сценария (должна быть определена на уровне модуля,
+                   чтобы передаваться в дочерние процессы)
+    :param items: - итератор сценариев (аргументов функции)
+    :param workers: - количество процессов (None - по количеству ядер; 1 без ограничения
+                      времени - последовательный расчет в текущем процессе)
+    :param chunk_size: - количество сценариев в одном пакете
+    :param timeout: - ограничение времени расчета одного сценария, с (None - без ограничения)
+    :return: генератор (result, error) в порядке сценариев: результат и None, либо None и текст ошибки
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер пакета должен быть не менее 1')
+    if workers == 1 and timeout is None:
+        for item in items:
+            yield run_item(func, item)
+        return
+    workers = workers or os.cpu_count() or 1
+    # количество пакетов в работе ограничено, чтобы не держать в памяти всю серию
+    max_pending = 2 * workers
+
+    def collect(chunk, future):
+        try:
+            return future.result()
+        except BrokenProcessPool:  # аварийное завершение дочернего процесса
+            return retry_chunk(func, chunk, timeout)
+        except Exception as error:
+            return [(None, f'{type(error).__name__}: {error}')] * len(chunk)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for chunk in chunks(items, chunk_size):
+            try:
+                future = executor.submit(run_chunk, func, chunk, timeout)
+            except BrokenProcessPool:
+                # пакеты в работе пересчитываются в collect по одному сценарию, остальные - в новом пуле
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                future = executor.submit(run_chunk, func, chunk, timeout)
+            pending.append((chunk, future))
+            if len(pending) >= max_pending:
+                yield from collect(*pending.popleft())
+        while pending:
+            yield from collect(*pending.popleft())
+    finally:
+        executor.shutdown()
@@ -0,0 +1,300 @@
+# -----------------------------------------------------------
+# Сквозной расчет сценария аварии: истечение -> пролив/испарение -> поражающие факторы
+#
+# Стадии сценария вычисляются лениво: при запросе результата считаются только
+# стадии, от которых он зависит, каждая стадия - не более одного раза.
+# Между стадиями передаются числа и массивы NumPy (без промежуточных списков).
+#
+# Пример:
+#     scenario = liquid_release({'volume': 6000, 'height': 15, 'pressure': 0, 'fill_factor': 0.75,
+#                                'hole_diametr': 100, 'density': 773, 'steam_pressure': 35,
+#                                'molar_mass': 100, 'heat_of_combustion': 46000, 'z': 0.1})
+#     scenario.get('explosion')  # истечение, пролив, испарение и взрыв; пожар пролива не считается
+#
+# Токсический выброс: toxic_release({..., 'substance': 'Хлор', 'exposure_time': 10}).get('toxic')
+#
+# Серия сценариев: evaluate_many([{"chain": "liquid", "params": {...}, "outputs": [...]}, ...])
+# -----------------------------------------------------------
+
+from types import MappingProxyType
+
+import numpy as np
+
+from calc import calc_liguid_outflow_tank
+from calc import calc_gas_outflow_small_hole
+from calc import calc_liguid_evaporation
+from calc import calc_evaporation_LPG
+from calc import calc_strait_fire
+from calc import calc_lower_concentration
+from calc import calc_fireball
+from calc import calc_sp_explosion
+from calc import calc_light_gas_disp
+from calc.parallel import parallel_map
+
+SPILL_FACTOR = 20  # коэф. разлития на спланированное покрытие, 1/м (на неспланированный грунт - 5)
+EVAPORATION_TIME = 3600  # время испарения, с
+EVAPORATION_STEP = 1  # шаг сетки времени испарения, с
+
+
+class Pipeline:
+    """
+    Сценарий из именованных стадий с ленивым вычислением.
+    Стадия - функция, аргументами которой являются значения других стадий
+    или параметров сценария (по именам). Параметры доступны только для чтения,
+    изменяются через set (со сбросом зависящих стадий).
+    """
+
+    def __init__(self, params: dict):
+        """
+        :param params: - параметры сценария {имя: значение}
+        """
+        self._params = dict(params)
+        self.stages = {}
+        self.values = {}
+
+    @property
+    def params(self):
+        'Параметры сценария (только для чтения)'
+        return MappingProxyType(self._params)
+
+    def set(self, name: str, value):
+        """
+        Изменение параметра сценария (значения зависящих от него стадий сбрасываются)
+        :param name: - имя параметра
+        :param value: - значение
+        :return: сценарий (для цепочки вызовов)
+        """
+        self._params[name] = value
+        self.invalidate(name)
+        return self
+
+    def default(self, name: str, value):
+        """
+        Значение параметра по умолчанию (если параметр не задан)
+        :param name: - имя параметра
+        :param value: - значение
+        :return: сценарий (для цепочки вызовов)
+        """
+        if name not in self._params:
+            self.set(name, value)
+        return self
+
+    def stage(self, name: str, func, *requires: str):
+        """
+        Добавление стадии (при замене стадии сбрасываются ее значение и значения
+        всех стадий, которые от нее зависят)
+        :param name: - имя стадии
+        :param func: - функция расчета стадии
+        :param requires: - имена стадий или параметров - аргументов функции (в порядке аргументов)
+        :return: сценарий (для цепочки вызовов)
+        """
+        self.stages[name] = (func, requires)
+        self.invalidate(name)
+        return self
+
+    def invalidate(self, name: str) -> None:
+        'Сброс значения стадии и всех стадий, зависящих от нее (или от параметра name), до пересчета'
+        self.values.pop(name, None)
+        for item, (_, requires) in self.stages.items():
+            if name in requires and item in self.values:
+                self.invalidate(item)
+
+    def get(self, name: str):
+        """
+        Значение стадии или параметра (стадия считается при первом запросе)
+        :param name: - имя стадии или параметра
+        :return: значение
+        :raise: ValueError, если нет ни стадии, ни параметра с таким именем
+        """
+        if name in self.values:
+            return self.values[name]
+        if name in self.stages:
+            func, requires = self.stages[name]
+            self.values[name] = func(*[self.get(item) for item in requires])
+            return self.values[name]
+        if name in self.params:
+            return self.params[name]
+        raise ValueError(f'Не задан параметр сценария: {name}')
+
+    def outputs(self, names) -> dict:
+        """
+        Значения нескольких стадий
+        :param names: - имена стадий или параметров
+        :return: словарь {имя: значение}
+        """
+        return {name: self.get(name) for name in names}
+
+
+def spill_area(mass: float, density: float, spill_factor: float, bund_area: float) -> float:
+    """
+    Площадь пролива, м2: по коэф. разлития, но не более площади обвалования
+    :param mass: - масса пролива, кг
+    :param density: - плотность жидкости, кг/м3
+    :param spill_factor: - коэф. разлития, 1/м
+    :param bund_area: - площадь обвалования, м2 (None - без обвалования)
+    """
+    area = spill_factor * mass / density
+    return area if bund_area is None else min(area, bund_area)
+
+
+def evaporation_time(duration: float, step: float) -> np.ndarray:
+    'Сетка времени испарения, с'
+    return np.arange(step, duration + step / 2, step)
+
+
+def limited_curve(curve: np.ndarray, mass: float) -> np.ndarray:
+    'Масса испарения с ограничением массой пролива, кг'
+    return np.minimum(curve, mass)
+
+
+def tank_stages(scenario: Pipeline) -> Pipeline:
+    'Истечение жидкости из резервуара и площадь пролива'
+    scenario.default('spill_factor', SPILL_FACTOR)
+    scenario.default('bund_area', None)
+    scenario.default('gas_expansion', False)
+    scenario.default('evaporation_time', EVAPORATION_TIME)
+    scenario.default('evaporation_step', EVAPORATION_STEP)
+    return (scenario
+            .stage('outflow',
+                   lambda *args: calc_liguid_outflow_tank.Outflow(*args[:-1]).result_arrays(gas_expansion=args[-1]),
+                   'volume', 'height', 'pressure', 'fill_factor', 'hole_diametr', 'density', 'gas_expansion')
+            .stage('time_outflow', lambda outflow: outflow[1], 'outflow')
+            .stage('flow_rate', lambda outflow: outflow[5], 'outflow')
+            .stage('mass_spill', lambda outflow: float(outflow[7][-1]), 'outflow')
+            .stage('spill_area', spill_area, 'mass_spill', 'density', 'spill_factor', 'bund_area')
+            .stage('time_evaporation', evaporation_time, 'evaporation_time', 'evaporation_step'))
+
+
+def vapour_stages(scenario: Pipeline, mass: str) -> Pipeline:
+    'Поражающие факторы облака паров (газа) массой mass'
+    scenario.default('t_boiling', 0)
+    return (scenario
+            .stage('lclp', calc_lower_concentration.LCLP().lower_concentration_limit,
+                   mass, 'molar_mass', 't_boiling', 'lower_concentration')
+            .stage('explosion', calc_sp_explosion.Explosion().explosion_class_zone,
+                   mass, 'heat_of_combustion', 'z'))
+
+
+def liquid_release(params: dict) -> Pipeline:
+    """
+    Пролив ЛВЖ из резервуара: истечение -> пролив -> испарение -> пожар пролива, НКПР, взрыв
+    Параметры: volume, height, pressure, fill_factor, hole_diametr, density (истечение,
+    calc_liguid_outflow_tank), spill_factor, bund_area (пролив), steam_pressure, molar_mass,
+    evaporation_time, evaporation_step (испарение), m_sg, t_boiling, wind_velocity (пожар пролива),
+    lower_concentration (НКПР), heat_of_combustion, z (взрыв)
+    Стадии: outflow, time_outflow, flow_rate, mass_spill, spill_area, time_evaporation,
+    evaporation, mass_vapour, strait_fire, lclp, explosion
+    """
+    scenario = tank_stages(Pipeline(params))
+    scenario.stage('evaporation',
+                   lambda time, pressure, molar_mass, area, mass: limited_curve(
+                       calc_liguid_evaporation.Liquid_evaporation().evaporation_curve(
+                           time, pressure, molar_mass, area), mass),
+                   'time_evaporation', 'steam_pressure', 'molar_mass', 'spill_area', 'mass_spill')
+    scenario.stage('mass_vapour', lambda curve: float(curve[-1]), 'evaporation')
+    scenario.stage('strait_fire', calc_strait_fire.Strait_fire().termal_class_zone,
+                   'spill_area', 'm_sg', 'molar_mass', 't_boiling', 'wind_velocity')
+    return vapour_stages(scenario, 'mass_vapour')
+
+
+def lpg_release(params: dict) -> Pipeline:
+    """
+    Пролив СУГ из резервуара: истечение -> пролив -> испарение -> огненный шар, НКПР, взрыв
+    Параметры: как в liquid_release для истечения и пролива, а также molar_mass, wind_velocity,
+    lpg_temperature, surface_temperature (испарение СУГ), ef (огненный шар),
+    lower_concentration (НКПР), heat_of_combustion, z (взрыв)
+    Стадии: outflow, time_outflow, flow_rate, mass_spill, spill_area, time_evaporation,
+    evaporation, mass_vapour, fireball, lclp, explosion
+    """
+    scenario = tank_stages(Pipeline(params))
+    scenario.default('wind_velocity', 1)
+    scenario.stage('evaporation',
+                   lambda time, molar_mass, area, wind, t_lpg, t_surface, mass: limited_curve(
+                       calc_evaporation_LPG.LPG_evaporation(molar_mass, area, wind, t_lpg, t_surface)
+                       .evaporation_curve(time), mass),
+                   'time_evaporation', 'molar_mass', 'spill_area', 'wind_velocity', 'lpg_temperature',
+                   'surface_temperature', 'mass_spill')
+    scenario.stage('mass_vapour', lambda curve: float(curve[-1]), 'evaporation')
+    scenario.stage('fireball', calc_fireball.Fireball().termal_class_zone, 'mass_spill', 'ef')
+    return vapour_stages(scenario, 'mass_vapour')
+
+
+def gas_stages(scenario: Pipeline) -> Pipeline:
+    'Истечение газа из емкости и масса выброса'
+    scenario.stage('outflow',
+                   lambda *args: tuple(np.asarray(item) for item in
+                                       calc_gas_outflow_small_hole.Outflow(*args).result_adaptive()),
+                   'volume', 'pressure', 'temperature', 'molar_mass', 'poisson_ratio', 'hole_diameter')
+    scenario.stage('time_outflow', lambda outflow: outflow[1], 'outflow')
+    scenario.stage('flow_rate', lambda outflow: outflow[5], 'outflow')
+    scenario.stage('mass_release', lambda outflow: float(outflow[0][0] - outflow[0][-1]), 'outflow')
+    return scenario
+
+
+def gas_release(params: dict) -> Pipeline:
+    """
+    Истечение газа из емкости -> НКПР, взрыв
+    Параметры: volume, pressure, temperature, molar_mass, poisson_ratio, hole_diameter
+    (истечение, calc_gas_outflow_small_hole), lower_concentration, t_boiling (НКПР),
+    heat_of_combustion, z (взрыв)
+    Стадии: outflow, time_outflow, flow_rate, mass_release, lclp, explosion
+    """
+    return vapour_stages(gas_stages(Pipeline(params)), 'mass_release')
+
+
+def toxic_release(params: dict) -> Pipeline:
+    """
+    Истечение токсичного газа из емкости -> рассеивание легкого газа -> токсодоза и вероятность поражения
+    (выброшенная масса газа рассматривается как первичное облако)
+    Параметры: volume, pressure, temperature, molar_mass, poisson_ratio, hole_diameter
+    (истечение, calc_gas_outflow_small_hole), ambient_temperature, cloud, wind_velocity,
+    is_night, is_urban_area, ejection_height (рассеивание, calc_light_gas_disp),
+    substance, exposure_time (поражение)
+    Стадии: outflow, time_outflow, flow_rate, mass_release, dispersion, toxic
+    (toxic - профиль по направлению ветра: dist, conc, dose, probit, probability)
+    """
+    scenario = gas_stages(Pipeline(params))
+    scenario.default('is_night', 0)
+    scenario.default('is_urban_area', 0)
+    scenario.default('ejection_height', 0)
+    scenario.stage('dispersion',
+                   lambda ambient, cloud, wind, night, urban, height, temperature, mass, molar_mass:
+                   calc_light_gas_disp.Source(ambient, cloud, wind, night, urban, height, temperature,
+                                              mass, 0, 0, molar_mass),
+                   'ambient_temperature', 'cloud', 'wind_velocity', 'is_night', 'is_urban_area',
+                   'ejection_height', 'temperature', 'mass_release', 'molar_mass')
+    scenario.stage('toxic', lambda source, substance, time: source.profile(substance=substance, exposure_time=time),
+                   'dispersion', 'substance', 'exposure_time')
+    return scenario
+
+
+CHAINS = {
+    'liquid': liquid_release,
+    'lpg': lpg_release,
+    'gas': gas_release,
+    'toxic': toxic_release,
+}
+
+
+def evaluate(scenario: dict) -> dict:
+    """
+    Расчет одного сценария
+    :param scenario: - словарь {"chain": ключ CHAINS, "params": {...}, "outputs": [имена стадий]}
+    :return: словарь {имя стадии: значение}
+    """
+    if scenario['chain'] not in CHAINS:
+        raise ValueError(f'Неизвестная цепочка расчета: {scenario["chain"]}')
+    return CHAINS[scenario['chain']](scenario['params']).outputs(scenario['outputs'])
+
+
+def evaluate_many(scenarios, workers: int = 1, chunk_size: int = 64, timeout: float = None):
+    """
+    Расчет серии сценариев последовательно (workers = 1 без ограничения времени)
+    или параллельно в нескольких процессах
+    :param scenarios: - итератор словарей сценариев (см. evaluate)
+    :param workers: - количество процессов (None - по количеству ядер)
+    :param chunk_size: - количество сценариев в пакете для одного процесса
+    :param timeout: - ограничение времени расчета одного сценария, с
+    :return: генератор (result, error) в порядке сценариев: результат и None, либо None и текст ошибки
+    """
+    return parallel_map(evaluate, scenarios, workers, chunk_size, timeout)
@@ -0,0 +1,305 @@
+# -----------------------------------------------------------
+# Расчет потенциального (индивидуального) риска по деревьям событий
+#
+# Дерево событий оборудования: частота разгерметизации и исходы с вероятностями
+# ветвей (воспламенение, вид горения и т.д.). Для каждого исхода вызывается
+# методика calc и берется профиль вероятности поражения по расстоянию.
+# Риск = сумма (частота исхода x вероятность поражения) по всем исходам.
+#
+# Исходы одного оборудования суммируются на общей радиальной сетке,
+# на двумерную сетку площадки она переносится один раз (на прямоугольник,
+# охватывающий зону действия), сложение выполняется на месте.
+#
+# Токсические выбросы действуют по направлению ветра: если для исхода задано
+# направление распространения облака, вероятность поражения считается в осях
+# облака (по ветру / поперек ветра), а не по всей окружности.
+# -----------------------------------------------------------
+
+import math
+import numpy as np
+
+from calc import calc_strait_fire
+from calc import calc_fireball
+from calc import calc_sp_explosion
+from calc import calc_tvs_explosion
+from calc import calc_lower_concentration
+from calc import calc_light_gas_disp
+from calc import calc_heavy_gas_disp
+
+RADIUS_STEP = 0.5  # шаг радиальной сетки при переносе на двумерную сетку, м
+
+
+def strait_fire_profile(*data) -> tuple:
+    'Пожар пролива: параметры Strait_fire.termal_radiation_profile'
+    res = calc_strait_fire.Strait_fire().termal_radiation_profile(*data)
+    return (res[0], res[3])
+
+
+def fireball_profile(*data) -> tuple:
+    'Огненный шар: параметры Fireball.fireball_profile'
+    res = calc_fireball.Fireball().fireball_profile(*data)
+    return (res[0], res[4])
+
+
+def sp_explosion_profile(*data) -> tuple:
+    'Взрыв по СП 12.13130-2009: параметры Explosion.explosion_profile'
+    res = calc_sp_explosion.Explosion().explosion_profile(*data)
+    return (res[0], res[4])
+
+
+def tvs_explosion_profile(*data) -> tuple:
+    'Взрыв по методике ТВС: параметры Explosion.explosion_profile'
+    res = calc_tvs_explosion.Explosion().explosion_profile(*data)
+    return (res[0], res[4])
+
+
+def flash_fire_profile(*data) -> tuple:
+    'Пожар-вспышка: параметры LCLP.lower_concentration_limit, поражение 1 в радиусе R_f'
+    radius_flash = calc_lower_concentration.LCLP().lower_concentration_limit(*data)[1]
+    return ([0, radius_flash], [1, 1])
+
+
+def light_gas_profile(*data) -> tuple:
+    'Легкий газ: параметры Source и далее вещество и время экспозиции, мин'
+    substance, exposure_time = data[-2:]
+    res = calc_light_gas_disp.Source(*data[:-2]).profile(substance=substance, exposure_time=exposure_time)
+    return (res[0], res[4])
+
+
+def heavy_gas_instantaneous_profile(*data) -> tuple:
+    'Тяжелый газ (перв.облако): параметры Instantaneous_source и далее вещество и время экспозиции, мин'
+    res = calc_heavy_gas_disp.Instantaneous_source(*data[:-2]).result(*data[-2:])
+    return (res[2], res[-1])
+
+
+def heavy_gas_continuous_profile(*data) -> tuple:
+    'Тяжелый газ (втор.облако): параметры Continuous_source и далее вещество и время экспозиции, мин'
+    res = calc_heavy_gas_disp.Continuous_source(*data[:-2]).result(*data[-2:])
+    return (res[2], res[-1])
+
+
+def light_gas_field(x, y, *data) -> np.ndarray:
+    'Легкий газ: вероятность поражения в точках (x - по ветру, y - поперек ветра, м), параметры light_gas_profile'
+    source = calc_light_gas_disp.Source(*data[:-2])
+    return source.toxic_effect(source.ground_concentration(x, y), *data[-2:])[1]
+
+
+def heavy_gas_instantaneous_field(x, y, *data) -> np.ndarray:
+    'Тяжелый газ (перв.облако): вероятность поражения в точках (x, y), параметры heavy_gas_instantaneous_profile'
+    res = calc_heavy_gas_disp.Instantaneous_source(*data[:-2]).result(*data[-2:])
+    return cloud_field(x, y, res[2], res[3], res[-1])
+
+
+def heavy_gas_continuous_field(x, y, *data) -> np.ndarray:
+    'Тяжелый газ (втор.облако): вероятность поражения в точках (x, y), параметры heavy_gas_continuous_profile'
+    res = calc_heavy_gas_disp.Continuous_source(*data[:-2]).result(*data[-2:])
+    return cloud_field(x, y, res[2], res[3], res[-1])
+
+
+def cloud_field(x, y, dist, width, probability) -> np.ndarray:
+    """
+    Вероятность поражения в точках (x, y) по профилю вдоль оси облака:
+    в пределах ширины облака - как на оси, за ее пределами и против ветра - 0
+    :param x: - расстояния по ветру, м
+    :param y: - расстояния поперек ветра, м
+    :param dist: - расстояния профиля, м
+    :param width: - ширина облака на расстояниях профиля, м
+    :param probability: - вероятность поражения на оси облака
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(dist) == 0:
+        return np.zeros_like(x)
+    inside = (x >= 0) & (np.abs(y) <= np.interp(x, dist, width) / 2)
+    return np.where(inside, np.interp(x, dist, probability, right=0), 0)
+
+
+# профили вероятности поражения по расстоянию (radius, probability) по наименованию методики;
+# для токсических выбросов профиль строится по оси облака - без заданного направления
+# долю направлений следует учитывать вероятностью ветви дерева событий
+PROFILES = {
+    'Пожар пролива': strait_fire_profile,
+    'Пожар-вспышка': flash_fire_profile,
+    'Огненный шар': fireball_profile,
+    'Взрыв (СП 12.13130-2009)': sp_explosion_profile,
+    'Взрыв (Методика ТВС)': tvs_explosion_profile,
+    'Легкий газ': light_gas_profile,
+    'Тяжелый газ (перв.облако)': heavy_gas_instantaneous_profile,
+    'Тяжелый газ (втор.облако)': heavy_gas_continuous_profile,
+}
+
+# методики, действующие по направлению ветра: вероятность поражения в точках (x, y) в осях облака
+FIELDS = {
+    'Легкий газ': light_gas_field,
+    'Тяжелый газ (перв.облако)': heavy_gas_instantaneous_field,
+    'Тяжелый газ (втор.облако)': heavy_gas_continuous_field,
+}
+
+
+def wind_axes(dx, dy, direction: float) -> tuple:
+    """
+    Перевод смещений от источника в оси облака
+    :param dx: - смещения по x, м
+    :param dy: - смещения по y, м
+    :param direction: - направление распространения облака, град (от оси x против часовой стрелки)
+    :return: (x, y): расстояния по ветру и поперек ветра, м
+    """
+    angle = math.radians(direction)
+    return (dx * math.cos(angle) + dy * math.sin(angle), dy * math.cos(angle) - dx * math.sin(angle))
+
+
+class Event_tree:
+    def __init__(self, frequency: float, name: str = ''):
+        """
+        Дерево событий для одного оборудования
+        :param frequency: - частота разгерметизации, 1/год
+        :param name: - наименование оборудования
+        """
+        self.frequency = frequency
+        self.name = name
+        self.outcomes = []  # [(name, вероятность ветвей, method, data, direction)]
+        self._profiles = {}
+
+    def outcome(self, branches, method: str, data, name: str = None, direction: float = None) -> 'Event_tree':
+        """
+        Добавление исхода
+        :param branches: - вероятности ветвей на пути от разгерметизации до исхода
+                           (например (0.2, 0.6) - воспламенение и вид горения)
+        :param method: - наименование методики (ключ PROFILES)
+        :param data: - параметры методики
+        :param name: - наименование исхода
+        :param direction: - направление распространения облака, град (от оси x против часовой стрелки),
+                            только для методик FIELDS; None - профиль по оси облака учитывается по всей окружности
+        :return: дерево (для цепочки вызовов)
+        """
+        if method not in PROFILES:
+            raise ValueError(f'Нет профиля вероятности поражения для методики: {method}')
+        if direction is not None and method not in FIELDS:
+            raise ValueError(f'Направление ветра задается только для токсических выбросов, методика: {method}')
+        probability = math.prod(branches)
+        if not 0 <= probability <= 1:
+            raise ValueError(f'Вероятность исхода должна быть от 0 до 1, получено {probability}')
+        self.outcomes.append((name or method, probability, method, tuple(data), direction))
+        return self
+
+    def frequencies(self) -> np.ndarray:
+        'Частоты исходов, 1/год'
+        return self.frequency * np.array([item[1] for item in self.outcomes], dtype=float)
+
+    def profile(self, index: int) -> tuple:
+        """
+        Профиль вероятности поражения исхода (считается один раз; одинаковые
+        методика и параметры у разных исходов не пересчитываются)
+        :param index: - номер исхода
+        :return: (radius, probability): массивы np.ndarray
+        """
+        _, _, method, data, _ = self.outcomes[index]
+        key = (method, data)
+        if key not in self._profiles:
+            radius, probability = PROFILES[method](*data)
+            self._profiles[key] = (np.asarray(radius, dtype=float), np.asarray(probability, dtype=float))
+        return self._profiles[key]
+
+    def directional(self, index: int) -> bool:
+        'Исход действует по направлению ветра (задано направление облака)'
+        return self.outcomes[index][4] is not None
+
+    def field(self, index: int, dx, dy) -> np.ndarray:
+        """
+        Вероятность поражения исхода с заданным направлением облака в точках
+        :param index: - номер исхода
+        :param dx: - смещения точек от источника по x, м
+        :param dy: - смещения точек от источника по y, м
+        :return: массив вероятности поражения
+        """
+        _, _, method, data, direction = self.outcomes[index]
+        return FIELDS[method](*wind_axes(dx, dy, direction), *data)
+
+    def radius_max(self) -> float:
+        'Максимальный радиус зоны действия по всем исходам, м'
+        return max((self.profile(i)[0][-1] for i in range(len(self.outcomes)) if self.profile(i)[0].size),
+                   default=0.0)
+
+
+class Radial_risk:
+    def __init__(self, radius):
+        """
+        Потенциальный риск на радиальной сетке вокруг оборудования
+        :param radius: - возрастающая сетка расстояний, м
+        """
+        self.radius = np.asarray(radius, dtype=float)
+        self.risk = np.zeros_like(self.radius)  # 1/год
+
+    def add(self, radius, probability, frequency: float) -> None:
+        """
+        Добавление исхода (на месте): risk += frequency * probability(radius),
+        за пределами профиля вероятность поражения 0
+        :param radius: - расстояния профиля, м
+        :param probability: - вероятность поражения на расстояниях профиля
+        :param frequency: - частота исхода, 1/год
+        """
+        radius = np.asarray(radius, dtype=float)
+        if frequency == 0 or radius.size == 0:
+            return
+        stop = np.searchsorted(self.radius, radius[-1], side='right')
+        value = np.interp(self.radius[:stop], radius, probability, right=0)
+        value *= frequency
+        self.risk[:stop] += value
+
+    def add_tree(self, tree: Event_tree) -> None:
+        'Добавление всех исходов дерева событий (на месте; токсические выбросы - по оси облака)'
+        for index, frequency in enumerate(tree.frequencies()):
+            self.add(*tree.profile(index), frequency)
+
+    def contour(self, level: float) -> float:
+        """
+        Радиус изолинии риска: наибольшее расстояние, на котором риск не меньше level
+        :param level: - уровень риска, 1/год (например 1e-6)
+        :return: радиус, м (0 - уровень не достигается)
+        """
+        index = np.flatnonzero(self.risk >= level)
+        return float(self.radius[index[-1]]) if index.size else 0.0
+
+
+class Risk_field:
+    def __init__(self, x, y):
+        """
+        Потенциальный риск на двумерной сетке площадки
+        :param x: - возрастающая сетка координат x, м
+        :param y: - возрастающая сетка координат y, м
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.risk = np.zeros((self.y.size, self.x.size))  # 1/год, строки - y, столбцы - x
+
+    def add_tree(self, tree: Event_tree, position: tuple, radius_step: float = RADIUS_STEP) -> None:
+        """
+        Добавление дерева событий оборудования, расположенного в точке position (на месте):
+        исходы суммируются на радиальной сетке, затем риск переносится на ячейки,
+        попадающие в квадрат зоны действия; исходы с заданным направлением облака
+        добавляются непосредственно на ячейки
+        :param tree: - дерево событий
+        :param position: - координаты оборудования (x, y), м
+        :param radius_step: - шаг радиальной сетки, м
+        """
+        radius_max = tree.radius_max()
+        if radius_max == 0:
+            return
+        radial = Radial_risk(np.arange(0, radius_max + radius_step, radius_step))
+        directional = []
+        for index, frequency in enumerate(tree.frequencies()):
+            if tree.directional(index):
+                directional.append((index, frequency))
+            else:
+                radial.add(*tree.profile(index), frequency)
+
+        x0, y0 = position
+        ix = slice(np.searchsorted(self.x, x0 - radius_max), np.searchsorted(self.x, x0 + radius_max, side='right'))
+        iy = slice(np.searchsorted(self.y, y0 - radius_max), np.searchsorted(self.y, y0 + radius_max, side='right'))
+        dx = self.x[ix][None, :] - x0
+        dy = self.y[iy][:, None] - y0
+        self.risk[iy, ix] += np.interp(np.hypot(dx, dy), radial.radius, radial.risk, right=0)
+        dx, dy = np.broadcast_arrays(dx, dy)
+        for index, frequency in directional:
+            if frequency:
+                self.risk[iy, ix] += frequency * tree.field(index, dx, dy)
@@ -0,0 +1,134 @@
+# -----------------------------------------------------------
+# Расчет коллективного (социального) риска: F-N кривая
+#
+# Население задается точками (здания) или растром (центры ячеек).
+# Для каждого места расположения оборудования население один раз
+# разбивается на кольца по расстоянию (ring-binning); ожидаемое количество
+# погибших в исходе N = сумма (население кольца x вероятность поражения
+# на среднем расстоянии кольца), поэтому расчет исхода не зависит
+# от количества точек населения.
+#
+# Токсические выбросы действуют только по направлению ветра, поэтому для них
+# направление облака обязательно (исход дерева событий на каждое направление),
+# а погибшие считаются по точкам населения в осях облака.
+# -----------------------------------------------------------
+
+import numpy as np
+
+from calc.risk import Event_tree, FIELDS
+
+RING_STEP = 0.5  # ширина кольца, м
+N_MIN = 1  # наименьшее количество погибших на F-N кривой, чел
+
+
+class Population:
+    def __init__(self, x, y, people):
+        """
+        Население в точках площадки
+        :param x: - координаты x точек, м
+        :param y: - координаты y точек, м
+        :param people: - количество людей в точках, чел (может быть дробным - среднее пребывание)
+        """
+        self.x = np.asarray(x, dtype=float).ravel()
+        self.y = np.asarray(y, dtype=float).ravel()
+        self.people = np.asarray(people, dtype=float).ravel()
+        if not self.x.size == self.y.size == self.people.size:
+            raise ValueError('Координаты и количество людей должны быть массивами одной длины')
+        self._rings = {}
+
+    @classmethod
+    def raster(cls, x, y, people) -> 'Population':
+        """
+        Население по растру
+        :param x: - координаты x центров ячеек, м
+        :param y: - координаты y центров ячеек, м
+        :param people: - количество людей в ячейках, чел (строки - y, столбцы - x)
+        :return: Population (учитываются только ячейки с людьми)
+        """
+        people = np.asarray(people, dtype=float)
+        grid_x, grid_y = np.meshgrid(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        occupied = people > 0
+        return cls(grid_x[occupied], grid_y[occupied], people[occupied])
+
+    def rings(self, position: tuple, radius_max: float, ring_step: float = RING_STEP) -> tuple:
+        """
+        Население в кольцах вокруг точки (считается один раз для точки, радиуса и шага)
+        :param position: - координаты центра (x, y), м
+        :param radius_max: - внешний радиус последнего кольца, м
+        :param ring_step: - ширина кольца, м
+        :return: (distance, people): среднее (по людям) расстояние кольца, м и население кольца, чел;
+                 только кольца с людьми
+        """
+        key = (tuple(position), radius_max, ring_step)
+        if key not in self._rings:
+            dist = np.hypot(self.x - position[0], self.y - position[1])
+            inside = dist <= radius_max
+            dist = dist[inside]
+            people = self.people[inside]
+            index = (dist / ring_step).astype(int)
+            ring_people = np.bincount(index, weights=people)
+            ring_dist = np.bincount(index, weights=people * dist)
+            occupied = ring_people > 0
+            self._rings[key] = (ring_dist[occupied] / ring_people[occupied], ring_people[occupied])
+        return self._rings[key]
+
+
+def expected_fatalities(population: Population, tree: Event_tree, position: tuple,
+                        ring_step: float = RING_STEP) -> np.ndarray:
+    """
+    Ожидаемое количество погибших для каждого исхода дерева событий
+    :param population: - население
+    :param tree: - дерево событий оборудования
+    :param position: - координаты оборудования (x, y), м
+    :param ring_step: - ширина кольца, м
+    :return: массив N по исходам, чел
+    :raise: ValueError, если для токсического выброса не задано направление облака
+    """
+    fatalities = np.zeros(len(tree.outcomes))
+    radius_max = tree.radius_max()
+    if radius_max == 0:
+        return fatalities
+    ring_dist, ring_people = population.rings(position, radius_max, ring_step)
+    for index in range(len(tree.outcomes)):
+        name, _, method, _, _ = tree.outcomes[index]
+        if method in FIELDS and not tree.directional(index):
+            raise ValueError(f'Для исхода {name} не задано направление распространения облака')
+        radius, probability = tree.profile(index)
+        if radius.size == 0:
+            continue
+        if tree.directional(index):
+            dx = population.x - position[0]
+            dy = population.y - position[1]
+            near = np.hypot(dx, dy) <= radius[-1]
+            fatalities[index] = np.dot(population.people[near], tree.field(index, dx[near], dy[near]))
+            continue
+        stop = np.searchsorted(ring_dist, radius[-1], side='right')
+        fatalities[index] = np.dot(ring_people[:stop], np.interp(ring_dist[:stop], radius, probability, right=0))
+    return fatalities
+
+
+def fn_curve(items, population: Population, ring_step: float = RING_STEP, n_min: float = N_MIN) -> tuple:
+    """
+    F-N кривая: частота F исходов с количеством погибших не менее N
+    :param items: - итератор (дерево событий, координаты оборудования (x, y))
+    :param population: - население
+    :param ring_step: - ширина кольца, м
+    :param n_min: - наименьшее количество погибших на кривой, чел
+    :return: (n, f): возрастающие значения N, чел и частоты F(N), 1/год
+    """
+    fatalities = []
+    frequencies = []
+    for tree, position in items:
+        fatalities.append(expected_fatalities(population, tree, position, ring_step))
+        frequencies.append(tree.frequencies())
+    if not fatalities:
+        return (np.array([]), np.array([]))
+    fatalities = np.concatenate(fatalities)
+    frequencies = np.concatenate(frequencies)
+
+    selected = fatalities >= n_min
+    n, inverse = np.unique(fatalities[selected], return_inverse=True)
+    # частоты исходов с одинаковым N складываются, затем накапливаются от больших N к меньшим
+    f = np.bincount(inverse, weights=frequencies[selected], minlength=n.size)
+    f = np.cumsum(f[::-1])[::-1]
+    return (n, f)
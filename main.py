@@ -30,43 +30,8 @@ from calc import calc_liguid_evaporation
 from calc import calc_evaporation_LPG
 from calc import calc_liquid_overflow
 from calc import calc_damage
+from calc.methods import METODS_AND_PARAMETRS
 
-METODS_AND_PARAMETRS = {
-    'Пожар пролива': ('Площадь, м2', 'm, кг/(с*м2) ', 'Mmol, кг/кмоль', 'Ткип, град.С', 'Ветер, м/с'),
-    'Пожар-вспышка': ('Масса, кг', 'Mmol, кг/кмоль', 'Ткип, град.С', 'НКПР, об.%'),
-    'Огненный шар': ('Масса, кг', 'Ef, кВт/м2'),
-    'Взрыв (СП 12.13130-2009)': ('Масса, кг', 'Qсг, кДж/кг ', 'z, -'),
-    'Взрыв (Методика ТВС)': ('Класс в-ва', 'Класс прост-ва', 'Масса, кг', 'Qсг, кДж/кг', 'sigma, -', 'Энергозапас, -'),
-    'Легкий газ': (
-        'Тем-ра воздуха, град. С', 'Облачность (0-8)', 'Cкорость ветра, м/с', 'Ночь (0/1)',
-        'Городская застройка (0/1)', 'Высота выброса, м', 'Тем-ра газа, град. С', 'Масса газа, кг',
-        'Расход газа, кг/с', 'Время отсечения, с', 'Молекулярная масса, кг/кмоль'),
-    'Тяжелый газ (перв.облако)': (
-        'Скорость ветра, м/с', 'Плотность воздуха, кг/м3', 'Плотность газа, кг/м3', 'Объем газа, м3'),
-    'Тяжелый газ (втор.облако)': (
-        'Скорость ветра, м/с', 'Плотность воздуха, кг/м3', 'Плотность газа, кг/м3', 'Расход газа, кг/с',
-        'Радиус выброса, м'),
-    'Истечение газа (емк.)': (
-        'Объем емк., м3', 'Давление, МПа', 'Тем-ра газа, град. С', 'Молекулярная масса, кг/кмоль', 'Коэф. адиабаты, -',
-        'Диаметр отверстия, мм'),
-    'Истечение газа (труб.)': (
-        'Диаметр трубопровода, м', 'Длина трубопровода, м', 'Давление, МПа', 'Тем-ра газа, град. С',
-        'Молекулярная масса, кг/кмоль', 'Коэф. адиабаты, -'),
-    'Истечение жидкости (емк.)': (
-        'Объем емк., м3', 'Высота взлива, м', 'Давление, МПа',
-        'Степень заполнения,-', ' Диаметр отверстия, мм', 'Плотность жидкости, кг/м3'),
-    'Истечение жидкости (труб.)': (
-        'Давление, МПа', 'Высот.отм. z1, м', 'Высот.отм. z2, м', ' Диаметр трубы, мм', 'Плотность жидкости, кг/м3',
-        'Длина трубопровода, м', ' Диаметр отверстия, мм', ' Время отключения давления, с',
-        ' Время закрытия арматуры, с'),
-    'Испарение жидкости': ('Давление пара, кПа', 'Молярная масса, кг/кмоль', 'Площадь пролива, м2'),
-    'Испарение СУГ': ('Молярная масса, кг/кмоль', 'Площадь пролива, м2', 'Скорость ветра, м/с', 'Тем-ра газа, град. С',
-                      'Тем-ра поверхности, град. С'),
-    'Гидродинамический перелив': ('Высота столба жидкости, м', 'Объем жидкости, м3',
-                                  'Расстояние до обвалования, м', 'Высота отбортовки, м'),
-    'Эконом.ущерб': ('Кол-во погибщих, чел', 'Кол-во пострадавших, чел', 'Аварийный объем, м3', 'Диаметр тр-да, мм',
-                      'Длина тр-да, м', 'Степень уничтожения (0...1)','Исп. масса, т', 'Масса пролива, т','Площадь пролива, м2',)
-}
 
 class Calc_gui(QtWidgets.QMainWindow):
     def __init__(self, parent=None) -> None:
@@ -273,7 +238,7 @@ class Calc_gui(QtWidgets.QMainWindow):
         elif text == 'Взрыв (Методика ТВС)':
             radius = calc_tvs_explosion.Explosion().explosion_class_zone(*data)
             self.result_text.setPlainText(self.report(text, radius))
-            result_tuple = calc_tvs_explosion.Explosion().explosion_array(*data)
+            result_tuple = calc_tvs_explosion.Explosion().explosion_profile(*data)
             self.create_chart(text, result_tuple)
 
         elif text == 'Легкий газ':